@@ -14,6 +14,7 @@ Catalog sources:
 
 import difflib
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional
 
 
@@ -1190,10 +1191,12 @@ _CLIENT_ALIASES: dict[str, str] = {
 # ============================================================================
 
 
+@lru_cache(maxsize=256)
 def resolve_model(raw: str) -> Optional[ModelSpec]:
     """Resolve a raw model string to a ModelSpec.
 
     Tries exact match, alias lookup, then fuzzy matching.
+    Results are memoized per raw string (the catalogs are static per process).
     """
     if not raw:
         return None
@@ -1231,10 +1234,12 @@ def resolve_model(raw: str) -> Optional[ModelSpec]:
     return None
 
 
+@lru_cache(maxsize=256)
 def resolve_client(raw: str) -> Optional[ClientSpec]:
     """Resolve a raw client string to a ClientSpec.
 
     Tries exact match, alias lookup, then fuzzy matching.
+    Results are memoized per raw string (the catalogs are static per process).
     """
     if not raw:
         return None
@@ -8,7 +8,12 @@ Phase 2: Config generation (identity, tools, skills, chunks, tips)
 Phase 4: Floating guardrails (universal + model + client + tier)
 """
 
+import bisect
+import hashlib
+import io
 import json
+import time
+from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
@@ -21,6 +26,7 @@ from .agent_profiles import (
     resolve_client,
 )
 from .auth import COMMUNITY_TOOLS, DEV_TOOLS, ADMIN_TOOLS
+from .knowledge_index import now_minute
 
 # Paths
 MIDOS_ROOT = Path(__file__).parent.parent.parent.resolve()
@@ -31,6 +37,20 @@ CLI_PROFILES_PATH = MIDOS_ROOT / "config" / "cli_profiles.json"
 # Cache for CLI profiles (loaded once per process)
 _cli_profiles_cache: Optional[dict] = None
 
+# Memoized generate_config results:
+# {(profile fingerprint, index version): (stored_at, (config, model, client))}
+_CONFIG_CACHE: dict = {}
+_CONFIG_CACHE_MAX = 64  # max entries, oldest evicted first
+# Entries also expire: vector search results and compatibility.json edits
+# do not show up in the directory mtimes of the index version
+_CONFIG_CACHE_TTL = 300  # seconds
+
+# Skill names under SKILLS_DIR: (dir mtime_ns, sorted names)
+_skills_cache: Optional[tuple[int, list[str]]] = None
+
+# Fallback chunk index: (chunks_dir mtime, [(normalized name, path), ...])
+_chunk_index_cache: Optional[tuple[int, list[tuple[str, Path]]]] = None
+
 
 # ============================================================================
 # MCP Tool Descriptions — for relevance ranking
@@ -178,6 +198,42 @@ GUARDRAILS = {
 }
 
 
+# ============================================================================
+# Output Tiers — per-section item limits for format_config
+# ============================================================================
+
+# None = no limit. Tiers not listed fall back to the "large" limit.
+_TIER_LIMITS: dict[str, dict[str, Optional[int]]] = {
+    "instructions": {"small": 2, "medium": None, "large": None},
+    "delegation_tasks": {"small": 3, "medium": 3, "large": None},
+    "extra_tools": {"small": 0, "medium": 5, "large": None},
+    "skills": {"small": 2, "medium": 5, "large": None},
+    "chunks": {"small": 1, "medium": 2, "large": 5},
+    "guardrails": {"small": 3, "medium": None, "large": None},
+    "tips": {"small": 2, "medium": 5, "large": None},
+    "suggestions": {"small": 2, "medium": None, "large": None},
+}
+
+# Context budget tiers: <=32K small, <=128K medium, larger is large
+_BUDGET_TIER_BOUNDS = (32000, 128000)
+_BUDGET_TIERS = ("small", "medium", "large")
+
+_HANDSHAKE_HEADER = (
+    "# MidOS Agent Handshake\n\n"
+    "## Getting Started (3 steps)\n\n"
+    "```\n"
+    "1. semantic_search('your topic here')\n"
+    "   → Check what MidOS already knows\n"
+    "\n"
+    "2. list_skills(stack='python,react')\n"
+    "   → Find reusable skill docs for your stack\n"
+    "\n"
+    "3. hybrid_search('specific question')\n"
+    "   → Deep search with grep + semantic fusion\n"
+    "```\n\n"
+)
+
+
 # ============================================================================
 # CLI Profile Loading
 # ============================================================================
@@ -286,7 +342,52 @@ def generate_config(profile: AgentProfile) -> dict[str, Any]:
       client_tips      - tips specific to the agent's CLI/IDE
       context_budget   - recommended token allocation
       suggestions      - proactive recommendations based on detected gaps
+
+    The profile-derived part is memoized per profile fingerprint and
+    on-disk index state for up to _CONFIG_CACHE_TTL seconds; the resume hint
+    and compatibility log are per call.
     """
+    key = (_profile_fingerprint(profile), _index_version())
+    now = time.time()
+    entry = _CONFIG_CACHE.get(key)
+    if entry is not None and now - entry[0] < _CONFIG_CACHE_TTL:
+        cached = entry[1]
+    else:
+        cached = _build_config(profile)
+        _CONFIG_CACHE.pop(key, None)  # re-insert at the end: eviction order is insertion order
+        if len(_CONFIG_CACHE) >= _CONFIG_CACHE_MAX:
+            del _CONFIG_CACHE[next(iter(_CONFIG_CACHE))]
+        _CONFIG_CACHE[key] = (now, cached)
+
+    base, model_spec, client_spec = cached
+    config = dict(base)
+
+    # Resume hint (BL-074): check for previous sessions
+    try:
+        from .session_logger import get_recent_sessions
+
+        recent = get_recent_sessions(client=profile.client, limit=1)
+        if recent:
+            last = recent[0]
+            config["resume_hint"] = {
+                "last_session": last["session_id"],
+                "last_active": last["last_activity"],
+                "tool_count": last["tool_count"],
+                "tip": "Call where_was_i() to resume your previous session",
+            }
+    except Exception:
+        pass  # Non-critical — don't break handshake
+
+    # Log compatibility data (non-blocking)
+    _log_compatibility(profile, model_spec, client_spec, config["context_budget"], config)
+
+    return config
+
+
+def _build_config(
+    profile: AgentProfile,
+) -> tuple[dict[str, Any], Optional[ModelSpec], Optional[ClientSpec]]:
+    """Build the cacheable part of generate_config. Returns (config, model_spec, client_spec)."""
     model_spec = resolve_model(profile.model)
     client_spec = resolve_client(profile.client)
 
@@ -310,27 +411,24 @@ def generate_config(profile: AgentProfile) -> dict[str, Any]:
         "context_budget": context_budget,
         "suggestions": _build_suggestions(profile, model_spec, client_spec),
     }
+    return config, model_spec, client_spec
 
-    # Resume hint (BL-074): check for previous sessions
-    try:
-        from .session_logger import get_recent_sessions
 
-        recent = get_recent_sessions(client=profile.client, limit=1)
-        if recent:
-            last = recent[0]
-            config["resume_hint"] = {
-                "last_session": last["session_id"],
-                "last_active": last["last_activity"],
-                "tool_count": last["tool_count"],
-                "tip": "Call where_was_i() to resume your previous session",
-            }
-    except Exception:
-        pass  # Non-critical — don't break handshake
+def _profile_fingerprint(profile: AgentProfile) -> bytes:
+    """Stable 16-byte digest of every AgentProfile field."""
+    raw = json.dumps(asdict(profile), sort_keys=True)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).digest()
 
-    # Log compatibility data (non-blocking)
-    _log_compatibility(profile, model_spec, client_spec, context_budget, config)
 
-    return config
+def _index_version() -> tuple[int, ...]:
+    """mtimes of the directories generate_config reads; a change invalidates cached configs."""
+    version = []
+    for d in (SKILLS_DIR, KNOWLEDGE_DIR / "skills", KNOWLEDGE_DIR / "chunks"):
+        try:
+            version.append(d.stat().st_mtime_ns)
+        except OSError:
+            version.append(0)
+    return tuple(version)
 
 
 def format_config(config: dict[str, Any], profile: AgentProfile) -> str:
@@ -343,37 +441,27 @@ def format_config(config: dict[str, Any], profile: AgentProfile) -> str:
     budget = config.get("context_budget", {})
     tier = budget.get("tier", "medium")
 
-    parts = []
+    buf = io.StringIO()
+    w = buf.write
 
     # --- GETTING STARTED (always first, action-oriented) ---
-    parts.append("# MidOS Agent Handshake\n")
-    parts.append("## Getting Started (3 steps)\n")
-    parts.append("```")
-    parts.append("1. semantic_search('your topic here')")
-    parts.append("   → Check what MidOS already knows")
-    parts.append("")
-    parts.append("2. list_skills(stack='python,react')")
-    parts.append("   → Find reusable skill docs for your stack")
-    parts.append("")
-    parts.append("3. hybrid_search('specific question')")
-    parts.append("   → Deep search with grep + semantic fusion")
-    parts.append("```\n")
+    w(_HANDSHAKE_HEADER)
 
     # --- Top 5 tools (compact table with tier indicators) ---
     tools = config.get("recommended_tools", [])[:5]
     if tools:
-        parts.append("## Top Tools\n")
-        parts.append("| Tool | Use for | Tier |")
-        parts.append("|------|---------|------|")
+        w("## Top Tools\n\n")
+        w("| Tool | Use for | Tier |\n")
+        w("|------|---------|------|\n")
         for t in tools:
             tier_label = t.get("min_tier", "dev").upper()
-            parts.append(f"| `{t['name']}` | {t['desc']} | {tier_label} |")
-        parts.append("")
+            w(f"| `{t['name']}` | {t['desc']} | {tier_label} |\n")
+        w("\n")
 
     # --- Identity (one line) ---
     identity = config["identity"]
-    parts.append(
-        f"**{identity['name']}** — {identity['description']} | Root: `{identity['root']}`\n"
+    w(
+        f"**{identity['name']}** — {identity['description']} | Root: `{identity['root']}`\n\n"
     )
 
     # Model/Client info (compact)
@@ -382,13 +470,13 @@ def format_config(config: dict[str, Any], profile: AgentProfile) -> str:
         model_label = m["id"]
         if profile.model and profile.model.lower() != m["id"].lower():
             model_label += f" (from '{profile.model}')"
-        parts.append(
+        w(
             f"**Model:** {model_label} | "
             f"Context: {m['context_window']:,} | "
-            f"Code: {m['code_score']}/10 | Speed: ~{m['speed_tps']} t/s"
+            f"Code: {m['code_score']}/10 | Speed: ~{m['speed_tps']} t/s\n"
         )
     elif profile.model:
-        parts.append(f"**Model:** {profile.model} (not in catalog — using defaults)")
+        w(f"**Model:** {profile.model} (not in catalog — using defaults)\n")
 
     if config["client_info"]:
         c = config["client_info"]
@@ -400,67 +488,57 @@ def format_config(config: dict[str, Any], profile: AgentProfile) -> str:
         if c.get("has_background_agents"):
             features.append("bg-agents")
         features_str = ", ".join(features) if features else "basic"
-        parts.append(
+        w(
             f"**Client:** {c['id']} | "
             f"MCP: {', '.join(c['mcp_transport'])} | "
-            f"Features: {features_str}"
+            f"Features: {features_str}\n"
         )
 
-    parts.append("")
+    w("\n")
 
     # Context budget (one line)
     cb = config["context_budget"]
-    parts.append(
-        f"**Context:** {cb.get('effective_window', 'unknown'):,} tokens | tier: {tier}\n"
-    )
+    w(f"**Context:** {cb.get('effective_window', 'unknown'):,} tokens | tier: {tier}\n\n")
 
     # CLI Role & Instructions
     cli_prof = config.get("cli_profile", {})
     if cli_prof:
         role = cli_prof.get("role", "general")
         display = cli_prof.get("display_name", cli_prof.get("id", "unknown"))
-        parts.append(f"## CLI Profile: {display} (role: {role})")
-        instructions = cli_prof.get("instructions", [])
-        if tier == "small":
-            instructions = instructions[:2]
+        w(f"## CLI Profile: {display} (role: {role})\n")
+        instructions = _tier_slice(cli_prof.get("instructions", []), "instructions", tier)
         for inst in instructions:
-            parts.append(f"- {inst}")
-        parts.append("")
+            w(f"- {inst}\n")
+        w("\n")
 
         # Tool restrictions summary
         restrictions = cli_prof.get("tool_restrictions", {})
         mode = restrictions.get("mode", "allowlist")
         denied = restrictions.get("denied", [])
         if denied:
-            parts.append(f"### Tool Restrictions ({mode})")
-            parts.append(f"Denied tools: {', '.join(denied)}")
-            parts.append(f"Reason: {restrictions.get('explanation', 'N/A')}")
-            parts.append("")
+            w(f"### Tool Restrictions ({mode})\n")
+            w(f"Denied tools: {', '.join(denied)}\n")
+            w(f"Reason: {restrictions.get('explanation', 'N/A')}\n\n")
 
         # Attention pinch
         pinch = cli_prof.get("attention_pinch", {})
         if pinch.get("enabled"):
-            parts.append(
-                f"### Attention Pinch (every {pinch.get('frequency_turns', 15)} turns)"
-            )
-            parts.append(f"- {pinch.get('message', '')}")
-            parts.append("")
+            w(f"### Attention Pinch (every {pinch.get('frequency_turns', 15)} turns)\n")
+            w(f"- {pinch.get('message', '')}\n\n")
 
         # Delegation policy (medium/large only)
         if tier != "small":
             delegation = cli_prof.get("delegation_policy", {})
             delegate_to = delegation.get("delegate_to", {})
             if delegate_to:
-                parts.append("### Delegation Policy")
+                w("### Delegation Policy\n")
                 strengths = delegation.get("your_strengths", [])
                 if strengths:
-                    parts.append(f"**Your strengths:** {', '.join(strengths[:3])}")
+                    w(f"**Your strengths:** {', '.join(strengths[:3])}\n")
                 for target_cli, tasks in delegate_to.items():
-                    tasks_str = (
-                        "; ".join(tasks[:3]) if tier == "medium" else "; ".join(tasks)
-                    )
-                    parts.append(f"- Delegate to **{target_cli}**: {tasks_str}")
-                parts.append("")
+                    tasks_str = "; ".join(_tier_slice(tasks, "delegation_tasks", tier))
+                    w(f"- Delegate to **{target_cli}**: {tasks_str}\n")
+                w("\n")
 
         # Search mode & response format
         search_mode = cli_prof.get("default_search_mode", "")
@@ -471,99 +549,32 @@ def format_config(config: dict[str, Any], profile: AgentProfile) -> str:
                 meta.append(f"Search: {search_mode}")
             if resp_format:
                 meta.append(f"Format: {resp_format}")
-            parts.append(f"**Defaults:** {' | '.join(meta)}")
-            parts.append("")
-
-    # Additional tools (skip top 5 already shown, show rest for medium/large)
-    all_tools = config.get("recommended_tools", [])
-    if tier != "small" and len(all_tools) > 5:
-        extra_tools = all_tools[5:]
-        if tier == "medium":
-            extra_tools = extra_tools[:5]
-        parts.append(f"## More Tools ({len(extra_tools)})")
-        for t in extra_tools:
-            tier_label = t.get("min_tier", "dev").upper()
-            parts.append(f"- **{t['name']}** — {t['desc']} [{tier_label}]")
-        parts.append("")
-
-    # Skills
-    skills = config["relevant_skills"]
-    if tier == "small":
-        skills = skills[:2]
-    elif tier == "medium":
-        skills = skills[:5]
-
-    if skills:
-        parts.append(f"## Relevant Skills ({len(skills)})")
-        for s in skills:
-            if isinstance(s, dict):
-                # New format: dict with name, path, reason, source
-                parts.append(f"- **{s['name']}** — {s.get('reason', '')}")
-            else:
-                # Legacy format: string
-                parts.append(f"- {s}")
-        parts.append("")
-
-    # Chunks (small=1 if project_goal set, medium=2, large=5)
-    chunks = config.get("relevant_chunks", [])
-    if chunks:
-        limit = 1 if tier == "small" else (2 if tier == "medium" else 5)
-        chunks = chunks[:limit]
-        parts.append(f"## Knowledge Chunks ({len(chunks)})")
-        for c in chunks:
-            parts.append(f"- **{c['name']}** ({c['path']})")
-            if tier == "large" and c.get("preview"):
-                parts.append(f"  > {c['preview'][:200]}...")
-        parts.append("")
-
-    # Guardrails
-    guardrails = config["guardrails"]
-    if guardrails:
-        if tier == "small":
-            guardrails = guardrails[:3]
-        parts.append(f"## Guardrails ({len(guardrails)})")
-        for g in guardrails:
-            parts.append(f"- {g}")
-        parts.append("")
-
-    # Tips
-    all_tips = config.get("model_tips", []) + config.get("client_tips", [])
-    if all_tips:
-        if tier == "small":
-            all_tips = all_tips[:2]
-        elif tier == "medium":
-            all_tips = all_tips[:5]
-        parts.append(f"## Tips ({len(all_tips)})")
-        for tip in all_tips:
-            parts.append(f"- {tip}")
-        parts.append("")
-
-    # Suggestions (proactive recommendations)
-    suggestions = config.get("suggestions", [])
-    if suggestions:
-        if tier == "small":
-            suggestions = suggestions[:2]
-        parts.append(f"## Suggestions ({len(suggestions)})")
-        for s in suggestions:
-            parts.append(f"- {s}")
-        parts.append("")
+            w(f"**Defaults:** {' | '.join(meta)}\n\n")
+
+    # Listed sections (more tools, skills, chunks, guardrails, tips, suggestions)
+    for header, select, section, fmt in _SECTIONS:
+        items = _tier_slice(select(config), section, tier)
+        if not items:
+            continue
+        w(f"## {header} ({len(items)})\n")
+        for item in items:
+            w(fmt(item, tier))
+        w("\n")
 
     # Resume hint (BL-074)
     resume = config.get("resume_hint")
     if resume:
         ago = _time_ago(resume.get("last_active", ""))
-        parts.append(f"## Resume Available")
-        parts.append(
+        w("## Resume Available\n")
+        w(
             f"Last session: `{resume['last_session']}` ({ago}, "
-            f"{resume.get('tool_count', 0)} tool calls)"
+            f"{resume.get('tool_count', 0)} tool calls)\n"
         )
-        parts.append(f"Call `where_was_i()` to get your full session summary.\n")
+        w("Call `where_was_i()` to get your full session summary.\n\n")
 
-    parts.append(
-        f"---\n_MidOS Handshake v1.1 -- {datetime.now().strftime('%Y-%m-%d %H:%M')}_"
-    )
+    w(f"---\n_MidOS Handshake v1.1 -- {now_minute()}_")
 
-    return "\n".join(parts)
+    return buf.getvalue()
 
 
 # ============================================================================
@@ -571,6 +582,53 @@ def format_config(config: dict[str, Any], profile: AgentProfile) -> str:
 # ============================================================================
 
 
+def _tier_slice(items: list, section: str, tier: str) -> list:
+    """Trim a section's items to the limit configured for the payload tier."""
+    limits = _TIER_LIMITS[section]
+    limit = limits.get(tier, limits["large"])
+    return items if limit is None else items[:limit]
+
+
+def _fmt_tool(t: dict, tier: str) -> str:
+    return f"- **{t['name']}** — {t['desc']} [{t.get('min_tier', 'dev').upper()}]\n"
+
+
+def _fmt_skill(s: Any, tier: str) -> str:
+    if isinstance(s, dict):
+        # New format: dict with name, path, reason, source
+        return f"- **{s['name']}** — {s.get('reason', '')}\n"
+    # Legacy format: string
+    return f"- {s}\n"
+
+
+def _fmt_chunk(c: dict, tier: str) -> str:
+    line = f"- **{c['name']}** ({c['path']})\n"
+    if tier == "large" and c.get("preview"):
+        line += f"  > {c['preview'][:200]}...\n"
+    return line
+
+
+def _fmt_bullet(item: str, tier: str) -> str:
+    return f"- {item}\n"
+
+
+# format_config list sections, in output order: (header, selector, _TIER_LIMITS key, formatter).
+# The top 5 tools are shown in the table above, so "More Tools" starts at index 5.
+_SECTIONS = (
+    ("More Tools", lambda c: c.get("recommended_tools", [])[5:], "extra_tools", _fmt_tool),
+    ("Relevant Skills", lambda c: c.get("relevant_skills", []), "skills", _fmt_skill),
+    ("Knowledge Chunks", lambda c: c.get("relevant_chunks", []), "chunks", _fmt_chunk),
+    ("Guardrails", lambda c: c.get("guardrails", []), "guardrails", _fmt_bullet),
+    (
+        "Tips",
+        lambda c: c.get("model_tips", []) + c.get("client_tips", []),
+        "tips",
+        _fmt_bullet,
+    ),
+    ("Suggestions", lambda c: c.get("suggestions", []), "suggestions", _fmt_bullet),
+)
+
+
 def _time_ago(iso_ts: str) -> str:
     """Convert ISO timestamp to human-readable 'X ago' string."""
     try:
@@ -634,28 +692,23 @@ def _compute_context_budget(
     client_spec: Optional[ClientSpec],
 ) -> dict:
     """Compute effective context window and payload tier."""
-    windows = []
-
-    if profile.context_window > 0:
-        windows.append(profile.context_window)
-    if model_spec and model_spec.context_window > 0:
-        windows.append(model_spec.context_window)
-    if client_spec and client_spec.max_context > 0:
-        windows.append(client_spec.max_context)
-
-    effective = min(windows) if windows else 128000  # default assumption
+    effective = min(
+        (
+            w
+            for w in (
+                profile.context_window,
+                model_spec.context_window if model_spec else 0,
+                client_spec.max_context if client_spec else 0,
+            )
+            if w > 0
+        ),
+        default=128000,  # default assumption
+    )
     effective = min(effective, 10_000_000)  # cap at 10M tokens
 
-    if effective <= 32000:
-        tier = "small"
-    elif effective <= 128000:
-        tier = "medium"
-    else:
-        tier = "large"
-
     return {
         "effective_window": effective,
-        "tier": tier,
+        "tier": _BUDGET_TIERS[bisect.bisect_left(_BUDGET_TIER_BOUNDS, effective)],
     }
 
 
@@ -866,7 +919,12 @@ def _find_skills(profile: AgentProfile) -> list[dict]:
 
 
 def _get_all_skills() -> list[str]:
-    """Get all available skill names."""
+    """Get all available skill names. Cached until SKILLS_DIR mtime changes."""
+    global _skills_cache
+    mtime = SKILLS_DIR.stat().st_mtime_ns
+    if _skills_cache is not None and _skills_cache[0] == mtime:
+        return _skills_cache[1]
+
     all_skills = set()
     for f in SKILLS_DIR.glob("*.md"):
         if not f.name.startswith("_"):
@@ -874,7 +932,8 @@ def _get_all_skills() -> list[str]:
     for d in SKILLS_DIR.iterdir():
         if d.is_dir():
             all_skills.add(d.name)
-    return sorted(all_skills)
+    _skills_cache = (mtime, sorted(all_skills))
+    return _skills_cache[1]
 
 
 def _find_skill_path(skill_name: str) -> Optional[Path]:
@@ -995,27 +1054,46 @@ def _find_chunks(profile: AgentProfile) -> list[dict]:
         return []
 
     MIN_KEYWORD_HITS = 2
-    results = []
-    for md_file in sorted(chunks_dir.glob("*.md"))[:50]:
-        name_lower = md_file.stem.lower().replace("-", " ").replace("_", " ")
-        hits = sum(1 for w in goal_words if w in name_lower)
+    matches = []
+    for name_norm, md_file in _load_chunk_index(chunks_dir):
+        hits = sum(1 for w in goal_words if w in name_norm)
         if hits >= MIN_KEYWORD_HITS:
-            preview = ""
-            try:
-                preview = md_file.read_text(encoding="utf-8", errors="ignore")[:300]
-            except OSError:
-                pass
-            results.append(
-                {
-                    "name": md_file.stem,
-                    "path": str(md_file.relative_to(MIDOS_ROOT)),
-                    "preview": preview,
-                    "score": hits,
-                }
-            )
+            matches.append((hits, md_file))
 
-    results.sort(key=lambda x: x["score"], reverse=True)
-    return results[:5]
+    # Only the top hits need a preview, and only its first 300 chars
+    matches.sort(key=lambda x: x[0], reverse=True)
+    results = []
+    for hits, md_file in matches[:5]:
+        preview = ""
+        try:
+            with md_file.open(encoding="utf-8", errors="ignore") as f:
+                preview = f.read(300)
+        except OSError:
+            pass
+        results.append(
+            {
+                "name": md_file.stem,
+                "path": str(md_file.relative_to(MIDOS_ROOT)),
+                "preview": preview,
+                "score": hits,
+            }
+        )
+    return results
+
+
+def _load_chunk_index(chunks_dir: Path) -> list[tuple[str, Path]]:
+    """List chunk files as (normalized name, path). Cached until chunks_dir mtime changes."""
+    global _chunk_index_cache
+    mtime = chunks_dir.stat().st_mtime_ns
+    if _chunk_index_cache is not None and _chunk_index_cache[0] == mtime:
+        return _chunk_index_cache[1]
+
+    entries = [
+        (f.stem.lower().replace("-", " ").replace("_", " "), f)
+        for f in sorted(chunks_dir.glob("*.md"))
+    ]
+    _chunk_index_cache = (mtime, entries)
+    return entries
 
 
 def _log_compatibility(
@@ -0,0 +1,275 @@
+"""
+Knowledge Index — Cached Directory Snapshots
+=============================================
+Process-local snapshots of the knowledge directories used by the MCP tools.
+
+A snapshot walks its root once and is reused across tool calls. It is
+revalidated by re-stat-ing every directory it walked (adding or removing a
+file bumps the parent directory's mtime), so a warm call costs one stat per
+directory instead of a full walk. File contents are loaded lazily, checked
+against the file's own mtime/size on each use, and kept in memory up to a
+process-wide budget of MIDOS_CONTENT_CACHE_MB megabytes (default 64; 0
+disables content caching). The budget counts resident bytes of the decoded
+strings (sys.getsizeof), so non-ASCII text is charged at its 2-4 bytes per
+character. Views derived from a listing (sorted names, counts) are memoized
+with it and dropped when it is rescanned.
+
+Also home to the small helpers shared by the server, the handshake engine
+and the bridge (footer timestamps, JSON encoding, atomic writes). The module
+is stdlib-only so the bridge can import it when run as a plain script.
+"""
+
+import itertools
+import json
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+try:
+    import orjson  # Optional speedup: pip install midos[speedups]
+except ImportError:
+    orjson = None
+
+T = TypeVar("T")
+
+# Max bytes of cached file content across all snapshots; beyond this, reads go to disk
+CONTENT_CACHE_MAX_BYTES = int(float(os.getenv("MIDOS_CONTENT_CACHE_MB", "64")) * 1024 * 1024)
+
+# Bytes of content currently cached, summed over every snapshot
+_cached_bytes_total = 0
+
+
+@dataclass(slots=True)
+class FileEntry:
+    """One file in a snapshot."""
+
+    path: str
+    name: str
+    size: int
+    mtime_ns: int
+    text: Optional[str] = None  # cached content, loaded on first read
+
+
+class DirSnapshot:
+    """Cached listing of files with the given suffixes under a root directory."""
+
+    def __init__(
+        self,
+        root: Path,
+        suffixes: tuple[str, ...] = (".md",),
+        recursive: bool = True,
+        skip_hidden: bool = True,
+    ) -> None:
+        self.root = str(root)
+        self.suffixes = suffixes
+        self.recursive = recursive
+        self.skip_hidden = skip_hidden  # False: also walk dot-directories, like Path.rglob
+        # ({dir path: mtime_ns}, entries, derived views) — replaced as a whole on refresh
+        self._state: Optional[tuple[dict[str, int], list[FileEntry], dict[str, Any]]] = None
+        self._cached_bytes = 0  # this snapshot's share of _cached_bytes_total
+        self._generations = itertools.count(1)
+
+    def entries(self) -> list[FileEntry]:
+        """Files in walk order (same order as Path.rglob / Path.glob)."""
+        return self._current()[1]
+
+    def derived(self, key: str, build: Callable[[list[FileEntry]], T]) -> T:
+        """build(entries), computed once per listing and reused until it changes."""
+        _, entries, views = self._current()
+        try:
+            return views[key]
+        except KeyError:
+            value = views[key] = build(entries)
+            return value
+
+    def generation(self) -> int:
+        """Number that changes whenever the listing is rescanned (for keying caches)."""
+        return self.derived("generation", lambda _: next(self._generations))
+
+    def _current(self) -> tuple[dict[str, int], list[FileEntry], dict[str, Any]]:
+        state = self._state
+        if state is None or not _dirs_unchanged(state[0]):
+            state = (*self._scan(), {})
+            self._state = state
+            self._release(self._cached_bytes)  # old entries (and their text) are dropped
+        return state
+
+    def _release(self, nbytes: int) -> None:
+        global _cached_bytes_total
+        self._cached_bytes -= nbytes
+        _cached_bytes_total -= nbytes
+
+    def read_text(self, entry: FileEntry) -> str:
+        """Entry content (utf-8, undecodable bytes dropped), re-read if the file changed."""
+        st = os.stat(entry.path)
+        if (
+            entry.text is not None
+            and st.st_mtime_ns == entry.mtime_ns
+            and st.st_size == entry.size
+        ):
+            return entry.text
+
+        global _cached_bytes_total
+        text = Path(entry.path).read_text(encoding="utf-8", errors="ignore")
+        entry.mtime_ns, entry.size = st.st_mtime_ns, st.st_size
+        if entry.text is not None:
+            self._release(sys.getsizeof(entry.text))
+            entry.text = None
+        nbytes = sys.getsizeof(text)
+        if _cached_bytes_total + nbytes <= CONTENT_CACHE_MAX_BYTES:
+            entry.text = text
+            self._cached_bytes += nbytes
+            _cached_bytes_total += nbytes
+        return text
+
+    def _scan(self) -> tuple[dict[str, int], list[FileEntry]]:
+        dir_mtimes: dict[str, int] = {}
+        entries: list[FileEntry] = []
+        try:
+            dir_mtimes[self.root] = os.stat(self.root).st_mtime_ns
+        except OSError:
+            return {self.root: -1}, entries  # -1: root missing, rescan once it appears
+
+        # Explicit scandir stack: DirEntry carries d_type, so classifying an
+        # entry needs no extra stat and no Path objects are built per file.
+        # Subdirs are pushed in reverse to keep rglob's pre-order walk.
+        stack = [self.root]
+        while stack:
+            dirpath = stack.pop()
+            subdirs = []
+            try:
+                with os.scandir(dirpath) as it:
+                    for entry in it:
+                        name = entry.name
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if self.recursive and not (self.skip_hidden and name.startswith(".")):
+                                    subdirs.append(entry.path)
+                            elif name.endswith(self.suffixes) and entry.is_file():
+                                st = entry.stat()
+                                entries.append(FileEntry(entry.path, name, st.st_size, st.st_mtime_ns))
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+            for sub in reversed(subdirs):
+                try:
+                    dir_mtimes[sub] = os.stat(sub).st_mtime_ns
+                except OSError:
+                    continue
+                stack.append(sub)
+
+        return dir_mtimes, entries
+
+
+def _dirs_unchanged(dir_mtimes: dict[str, int]) -> bool:
+    for d, mtime in dir_mtimes.items():
+        try:
+            if os.stat(d).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            if mtime != -1:
+                return False
+    return True
+
+
+_SNAPSHOTS: dict[tuple[str, tuple[str, ...], bool, bool], DirSnapshot] = {}
+
+
+def snapshot(
+    root: Path,
+    suffixes: tuple[str, ...] = (".md",),
+    recursive: bool = True,
+    skip_hidden: bool = True,
+) -> DirSnapshot:
+    """Shared snapshot for (root, suffixes, recursive, skip_hidden), created on first use."""
+    key = (str(root), tuple(suffixes), recursive, skip_hidden)
+    snap = _SNAPSHOTS.get(key)
+    if snap is None:
+        snap = _SNAPSHOTS.setdefault(key, DirSnapshot(root, key[1], recursive, skip_hidden))
+    return snap
+
+
+# path -> (mtime_ns, NUL-joined lowercased languages + frameworks)
+_COMPAT_CACHE: dict[str, tuple[int, str]] = {}
+
+
+def load_compat(path: Path) -> Optional[str]:
+    """Lowercased languages + frameworks of a compatibility.json, or None.
+
+    Entries are joined with NUL so "token in any entry" is a single substring
+    scan. Parsed once per file version (mtime); missing or unreadable files
+    give None.
+    """
+    key = str(path)
+    try:
+        mtime = os.stat(key).st_mtime_ns
+    except OSError:
+        return None
+    cached = _COMPAT_CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    try:
+        compat = json.loads(Path(key).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    compat_all = "\0".join(
+        [x.lower() for x in compat.get("languages", [])]
+        + [x.lower() for x in compat.get("frameworks", [])]
+    )
+    _COMPAT_CACHE[key] = (mtime, compat_all)
+    return compat_all
+
+
+# ============================================================================
+# Shared helpers
+# ============================================================================
+
+# Formatted footer timestamp: [epoch minute, "YYYY-MM-DD HH:MM"]
+_TS_CACHE: list = [-1, ""]
+
+
+def now_minute() -> str:
+    """Local time as 'YYYY-MM-DD HH:MM'. strftime runs at most once per minute."""
+    t = time.time()
+    minute = int(t // 60)
+    if minute != _TS_CACHE[0]:
+        _TS_CACHE[0] = minute
+        _TS_CACHE[1] = datetime.fromtimestamp(t).strftime("%Y-%m-%d %H:%M")
+    return _TS_CACHE[1]
+
+
+def dumps_json(data: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Encode data as indented UTF-8 JSON (orjson when installed, stdlib otherwise).
+
+    Dataclasses are encoded as objects: natively by orjson, via asdict() otherwise.
+    Other unsupported types go to default (TypeError when it is None).
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=default
+        )
+
+    def fallback(obj: Any) -> Any:
+        if is_dataclass(obj) and not isinstance(obj, type):
+            return asdict(obj)
+        if default is None:
+            raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+        return default(obj)
+
+    return json.dumps(data, indent=2, ensure_ascii=False, default=fallback).encode("utf-8")
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write via a temp file + os.replace so readers never see a partial file.
+
+    Creates the parent directory if needed.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
@@ -25,11 +25,19 @@ Set MIDOS_ROOT env var to point to the MidOS project root.
 """
 
 import sys
-import json
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from datetime import datetime
 
+try:
+    from .knowledge_index import dumps_json, now_minute, snapshot, write_atomic
+except ImportError:  # run as a script: python modules/mcp_server/midos_bridge.py
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from knowledge_index import dumps_json, now_minute, snapshot, write_atomic
+
 # Resolve root from env var, fall back to script parent traversal
 MIDOS_ROOT = Path(os.getenv("MIDOS_ROOT", Path(__file__).resolve().parent.parent.parent))
 KNOWLEDGE = MIDOS_ROOT / "knowledge"
@@ -40,74 +48,141 @@ SYNAPSE = MIDOS_ROOT / "synapse"
 TOPOLOGY = KNOWLEDGE / "topology"
 
 
+# SKILLS directory listing, refreshed when the directory mtime changes
+_SKILLS_CACHE: dict = {"mtime": None, "entries": [], "dirs": []}
+
+# Files are read in bounded chunks so a scan can stop once every word is seen
+READ_CHUNK_CHARS = 65536
+# Upper bound on threads used to read files concurrently during a search
+SCAN_MAX_WORKERS = 32
+
+
+def _scan_file(path: Path, words: list[str], preview_chars: int) -> tuple[set[str], str, int]:
+    """Stream a file looking for lowercase words.
+
+    Returns (words found, first preview_chars of the file, size in bytes).
+    Reading stops as soon as every word has been seen.
+    """
+    remaining = set(words)
+    found: set[str] = set()
+    overlap = max((len(w) for w in remaining), default=1) - 1
+
+    with path.open(encoding="utf-8", errors="replace") as f:
+        size = os.fstat(f.fileno()).st_size
+        chunk = f.read(READ_CHUNK_CHARS)
+        preview = chunk[:preview_chars]
+        tail = ""
+        while chunk and remaining:
+            # Carry the previous tail so words split across chunks still match
+            window = tail + chunk.lower()
+            hits = {w for w in remaining if w in window}
+            found |= hits
+            remaining -= hits
+            tail = window[-overlap:] if overlap else ""
+            chunk = f.read(READ_CHUNK_CHARS)
+
+    return found, preview, size
+
+
+def _score_file(md_file: Path, query_words: list[str]) -> dict | None:
+    """Score one knowledge file against the query. None if it does not match."""
+    try:
+        name_lower = md_file.name.lower()
+        found, head, size = _scan_file(
+            md_file, [w for w in query_words if w not in name_lower], 300
+        )
+    except OSError:
+        return None
+
+    # Score: cuantas palabras del query aparecen
+    score = sum(1 for w in query_words if w in found or w in name_lower)
+    if score == 0:
+        return None
+
+    # Bonus por nombre de archivo match
+    if any(w in name_lower for w in query_words):
+        score += 2
+
+    # Bonus por EUREKA
+    if "EUREKA" in str(md_file):
+        score += 1
+
+    return {
+        "path": str(md_file.relative_to(MIDOS_ROOT)),
+        "score": score,
+        "preview": head.replace("\n", " ").strip(),
+        "size": size
+    }
+
+
+def _scan_parallel(fn, paths: list[Path]) -> list[dict]:
+    """Run fn over paths in a thread pool (reads release the GIL). Keeps path order."""
+    if not paths:
+        return []
+    with ThreadPoolExecutor(max_workers=min(SCAN_MAX_WORKERS, len(paths))) as ex:
+        return [r for r in ex.map(fn, paths) if r]
+
+
 def search_knowledge(query: str, max_results: int = 5) -> list[dict]:
     """Buscar en toda la knowledge base de MidOS."""
-    results = []
-    query_lower = query.lower()
-    query_words = query_lower.split()
-
-    for md_file in KNOWLEDGE.rglob("*.md"):
-        try:
-            content = md_file.read_text(encoding="utf-8", errors="replace")
-            content_lower = content.lower()
-            name_lower = md_file.name.lower()
-
-            # Score: cuantas palabras del query aparecen
-            score = sum(1 for w in query_words if w in content_lower or w in name_lower)
-            if score == 0:
-                continue
-
-            # Bonus por nombre de archivo match
-            if any(w in name_lower for w in query_words):
-                score += 2
-
-            # Bonus por EUREKA
-            if "EUREKA" in str(md_file):
-                score += 1
-
-            rel_path = md_file.relative_to(MIDOS_ROOT)
-            preview = content[:300].replace("\n", " ").strip()
-
-            results.append({
-                "path": str(rel_path),
-                "score": score,
-                "preview": preview,
-                "size": len(content)
-            })
-        except OSError:
-            continue
+    query_words = query.lower().split()
+    paths = [Path(e.path) for e in snapshot(KNOWLEDGE, skip_hidden=False).entries()]
+    results = _scan_parallel(partial(_score_file, query_words=query_words), paths)
 
     results.sort(key=lambda x: x["score"], reverse=True)
     return results[:max_results]
 
 
+def _match_eureka(md_file: Path, pattern: re.Pattern) -> dict | None:
+    """Match one EUREKA file against the query pattern. None if it does not match."""
+    try:
+        content = md_file.read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return None
+    if pattern.search(md_file.name) or pattern.search(content):
+        return {
+            "file": md_file.name,
+            "preview": content[:400].replace("\n", " ").strip()
+        }
+    return None
+
+
 def search_eureka(query: str) -> list[dict]:
     """Buscar solo en EUREKA (conocimiento validado)."""
-    results = []
-    query_lower = query.lower()
-
-    query_words = query_lower.split()
-    for md_file in EUREKA.glob("*.md"):
-        try:
-            content = md_file.read_text(encoding="utf-8", errors="replace")
-            content_low = content.lower()
-            name_low = md_file.name.lower()
-            if any(w in content_low or w in name_low for w in query_words):
-                results.append({
-                    "file": md_file.name,
-                    "preview": content[:400].replace("\n", " ").strip()
-                })
-        except OSError:
-            continue
-
-    return results
+    query_words = query.split()
+    if not query_words:
+        return []
+    # One case-insensitive alternation instead of lowercasing every file
+    pattern = re.compile("|".join(map(re.escape, query_words)), re.IGNORECASE)
+    paths = [Path(e.path) for e in snapshot(EUREKA, recursive=False).entries()]
+    return _scan_parallel(partial(_match_eureka, pattern=pattern), paths)
+
+
+def _skills_listing() -> dict:
+    """Entries under SKILLS ({"entries": all names, "dirs": sorted dir names}).
+
+    Re-enumerated only when the directory mtime changes.
+    """
+    try:
+        mtime = SKILLS.stat().st_mtime_ns
+    except OSError:
+        return {"entries": [], "dirs": []}
+
+    if mtime != _SKILLS_CACHE["mtime"]:
+        entries, dirs = [], []
+        for f in SKILLS.iterdir():
+            if f.is_dir():
+                dirs.append(f.name)
+                entries.append(f.name)
+            elif f.is_file():
+                entries.append(f.name)
+        _SKILLS_CACHE.update(mtime=mtime, entries=entries, dirs=sorted(dirs))
+    return _SKILLS_CACHE
 
 
 def list_skills() -> list[str]:
     """Listar skills disponibles en MidOS."""
-    if not SKILLS.exists():
-        return []
-    return [f.name for f in SKILLS.iterdir() if f.is_file() or f.is_dir()]
+    return list(_skills_listing()["entries"])
 
 
 def get_skill(name: str) -> str:
@@ -136,29 +211,8 @@ def get_topology() -> str:
     return "Topology file not found."
 
 
-def build_bootstrap_payload() -> str:
-    """
-    Build the structured onboarding payload for agents connecting to MidOS.
-    Every line is actionable. No decoration.
-    """
-    # --- Skills inventory ---
-    skills_list = []
-    if SKILLS.exists():
-        for d in sorted(SKILLS.iterdir()):
-            if d.is_dir():
-                skills_list.append(d.name)
-
-    # --- Knowledge stats ---
-    knowledge_count = 0
-    eureka_count = 0
-    if KNOWLEDGE.exists():
-        knowledge_count = sum(1 for _ in KNOWLEDGE.rglob("*.md"))
-    if EUREKA.exists():
-        eureka_count = sum(1 for _ in EUREKA.glob("*.md"))
-
-    skills_block = "\n".join(f"  - {s}" for s in skills_list) if skills_list else "  (none found)"
-
-    payload = f"""# MidOS Agent Bootstrap
+# Bootstrap payload sections that depend only on MIDOS_ROOT, rendered once at import
+_BOOTSTRAP_HEAD = f"""# MidOS Agent Bootstrap
 
 ## Identity
 
@@ -167,8 +221,50 @@ def build_bootstrap_payload() -> str:
 - **Role**: Knowledge vault, research execution, tool orchestration
 - **Hierarchy**: MidOS (Core) → Project Agents → Client Projects
 - **Philosophy**: Noble use of resources. Every token must be substantive and actionable.
+"""
+
+_BOOTSTRAP_TAIL = f"""## Guardrails (Mandatory)
+
+1. **Windows/PowerShell**: Use `;` not `&&` to chain commands. Use `python -c` as universal fallback.
+2. **Polling**: Max 10s between command status checks. Never wait 60s passively.
+3. **Secrets**: Never hardcode API keys. Use `os.getenv()` + `.env` files.
+4. **Index Primacy**: Check `docs/TOOLS_INDEX.md` before creating tools. Check `knowledge/` before creating knowledge.
+5. **No Duplication**: Synthesize into existing sources, never scatter.
+
+## Quick Start
+
+```bash
+# Search for existing knowledge before implementing anything
+python {MIDOS_ROOT}/modules/mcp_server/midos_bridge.py ask "your question"
+
+# Find validated patterns
+python {MIDOS_ROOT}/modules/mcp_server/midos_bridge.py eureka "topic"
+
+# List available skills
+python {MIDOS_ROOT}/modules/mcp_server/midos_bridge.py skills
+
+# Submit research task to MidOS
+python {MIDOS_ROOT}/modules/mcp_server/midos_bridge.py submit "research topic X"
+```
+
+---"""
+
+
+def build_bootstrap_payload() -> str:
+    """
+    Build the structured onboarding payload for agents connecting to MidOS.
+    Every line is actionable. No decoration.
+    """
+    # --- Skills inventory ---
+    skills_list = _skills_listing()["dirs"]
 
-## Architecture (Key Directories)
+    # --- Knowledge stats (cached snapshots; empty when the directory is missing) ---
+    knowledge_count = len(snapshot(KNOWLEDGE, skip_hidden=False).entries())
+    eureka_count = len(snapshot(EUREKA, recursive=False).entries())
+
+    skills_block = "\n".join(f"  - {s}" for s in skills_list) if skills_list else "  (none found)"
+
+    live = f"""## Architecture (Key Directories)
 
 | Directory | Purpose |
 |---|---|
@@ -196,52 +292,25 @@ def build_bootstrap_payload() -> str:
 ## Skills ({len(skills_list)})
 
 {skills_block}
-
-## Guardrails (Mandatory)
-
-1. **Windows/PowerShell**: Use `;` not `&&` to chain commands. Use `python -c` as universal fallback.
-2. **Polling**: Max 10s between command status checks. Never wait 60s passively.
-3. **Secrets**: Never hardcode API keys. Use `os.getenv()` + `.env` files.
-4. **Index Primacy**: Check `docs/TOOLS_INDEX.md` before creating tools. Check `knowledge/` before creating knowledge.
-5. **No Duplication**: Synthesize into existing sources, never scatter.
-
-## Quick Start
-
-```bash
-# Search for existing knowledge before implementing anything
-python {MIDOS_ROOT}/modules/mcp_server/midos_bridge.py ask "your question"
-
-# Find validated patterns
-python {MIDOS_ROOT}/modules/mcp_server/midos_bridge.py eureka "topic"
-
-# List available skills
-python {MIDOS_ROOT}/modules/mcp_server/midos_bridge.py skills
-
-# Submit research task to MidOS
-python {MIDOS_ROOT}/modules/mcp_server/midos_bridge.py submit "research topic X"
-```
-
----
-_MidOS Bootstrap v2026.2 — {datetime.now().strftime('%Y-%m-%d %H:%M')}_
 """
-    return payload.strip()
+    footer = f"_MidOS Bootstrap v2026.2 — {now_minute()}_"
+    return "\n".join((_BOOTSTRAP_HEAD, live, _BOOTSTRAP_TAIL, footer))
 
 
 def submit_task(prompt: str, source: str = "BRIDGE") -> str:
     """Enviar tarea al inbox de MidOS para procesamiento asincrono."""
-    task_id = f"CMD_{source}_{int(datetime.now().timestamp())}"
+    now = datetime.now()
+    task_id = f"CMD_{source}_{int(now.timestamp())}"
     payload = {
         "id": task_id,
         "source": source,
         "prompt": prompt,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now.isoformat()
     }
 
     inbox_dir = SYNAPSE / "inbox"
     inbox_dir.mkdir(parents=True, exist_ok=True)
-    (inbox_dir / f"{task_id}.json").write_text(
-        json.dumps(payload, indent=2), encoding="utf-8"
-    )
+    write_atomic(inbox_dir / f"{task_id}.json", dumps_json(payload))
     return f"Task {task_id} submitted. Status: QUEUED."
 
 
@@ -262,8 +331,23 @@ def ask(question: str) -> dict:
 # ─── CLI MODE ───────────────────────────────────────────────
 
 def print_json(data):
-    sys.stdout.reconfigure(encoding="utf-8")
-    print(json.dumps(data, indent=2, ensure_ascii=False, default=str))
+    sys.stdout.flush()
+    sys.stdout.buffer.write(dumps_json(data, default=str) + b"\n")
+    sys.stdout.buffer.flush()
+
+
+# Command table: name -> (requires arguments, handler(args))
+_COMMANDS = {
+    "ask": (True, lambda a: print_json(ask(" ".join(a)))),
+    "search": (True, lambda a: print_json(search_knowledge(" ".join(a)))),
+    "eureka": (True, lambda a: print_json(search_eureka(" ".join(a)))),
+    "skills": (False, lambda a: print_json(list_skills())),
+    "skill": (True, lambda a: print(get_skill(a[0]))),
+    "topology": (False, lambda a: print(get_topology())),
+    "submit": (True, lambda a: print(submit_task(" ".join(a)))),
+    "bootstrap": (False, lambda a: print(build_bootstrap_payload())),
+    "--mcp": (False, lambda a: run_mcp_server()),
+}
 
 
 def cli_main():
@@ -291,41 +375,14 @@ Ejemplo:
         return
 
     cmd = sys.argv[1].lower()
+    args = sys.argv[2:]
 
-    if cmd == "ask" and len(sys.argv) > 2:
-        query = " ".join(sys.argv[2:])
-        print_json(ask(query))
-
-    elif cmd == "search" and len(sys.argv) > 2:
-        query = " ".join(sys.argv[2:])
-        print_json(search_knowledge(query))
-
-    elif cmd == "eureka" and len(sys.argv) > 2:
-        query = " ".join(sys.argv[2:])
-        print_json(search_eureka(query))
-
-    elif cmd == "skills":
-        print_json(list_skills())
-
-    elif cmd == "skill" and len(sys.argv) > 2:
-        print(get_skill(sys.argv[2]))
-
-    elif cmd == "topology":
-        print(get_topology())
-
-    elif cmd == "submit" and len(sys.argv) > 2:
-        prompt = " ".join(sys.argv[2:])
-        print(submit_task(prompt))
-
-    elif cmd == "bootstrap":
-        print(build_bootstrap_payload())
-
-    elif cmd == "--mcp":
-        run_mcp_server()
-
-    else:
+    entry = _COMMANDS.get(cmd)
+    if entry is None or (entry[0] and not args):
         print(f"Comando no reconocido: {cmd}")
         print("Usa 'python midos_bridge.py' sin argumentos para ver ayuda.")
+        return
+    entry[1](args)
 
 
 # ─── MCP SERVER MODE ────────────────────────────────────────
@@ -365,7 +422,7 @@ def run_mcp_server():
             return f"No results for '{query}'"
         lines = [f"# MidOS Search: '{query}'", ""]
         for r in results:
-            lines.append(f"**{r['path']}** (score: {r['score']}, {r['size']} chars)")
+            lines.append(f"**{r['path']}** (score: {r['score']}, {r['size']} bytes)")
             lines.append(r["preview"][:200])
             lines.append("")
         return "\n".join(lines)
@@ -49,20 +49,41 @@ RESOURCES (1):
     - midos://skill/{skill_name}: Read skill files as MCP resources
 """
 
+import asyncio
+import heapq
 import json
+import mmap
+import operator
 import os
+import re
 import sys
 import time
 from pathlib import Path
 from typing import Optional, List, Dict, Any
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urlparse
 
 # FastMCP imports
 from fastmcp import FastMCP
 from fastmcp.exceptions import ToolError
+from fastmcp.server.dependencies import get_http_headers
+
+try:
+    from starlette.responses import Response  # Health routes (ships with fastmcp)
+except ImportError:
+    Response = None
 
 # MidOS auth middleware
 from modules.mcp_server.auth import ApiKeyMiddleware
+from modules.mcp_server.knowledge_index import (
+    dumps_json,
+    load_compat,
+    now_minute,
+    snapshot,
+    write_atomic,
+)
 
 # === HIVE COMMONS: Unified configuration ===
 try:
@@ -80,12 +101,64 @@ except ImportError:
 MIDOS_ROOT = L1_ROOT
 KNOWLEDGE_DIR = L1_KNOWLEDGE
 SKILLS_DIR = KNOWLEDGE_DIR / "skills"
+_SKILLS_DIR_RESOLVED = SKILLS_DIR.resolve()  # containment root for skill resources
 PROTOCOLS_DIR = KNOWLEDGE_DIR / "protocols"
 EUREKA_DIR = KNOWLEDGE_DIR / "EUREKA"
 TRUTH_DIR = KNOWLEDGE_DIR / "truth"
 SYNAPSE_DIR = L1_SYNAPSE
 _SERVER_START_TIME = time.time()
 
+# === HOOKS: coordination pool, episodic memory, code chunker (optional) ===
+_HOOKS_DIR = str(MIDOS_ROOT / "hooks")
+if _HOOKS_DIR not in sys.path:
+    sys.path.insert(0, _HOOKS_DIR)
+_HOOK_IMPORT_ERRORS: Dict[str, ImportError] = {}
+try:
+    from instance_pool import get_pool
+except ImportError as e:
+    get_pool = None
+    _HOOK_IMPORT_ERRORS["instance_pool"] = e
+try:
+    from episodic_memory import search_reflexions, store_reflexion
+except ImportError as e:
+    search_reflexions = store_reflexion = None
+    _HOOK_IMPORT_ERRORS["episodic_memory"] = e
+try:
+    from ast_chunker import chunk_file
+except ImportError as e:
+    chunk_file = None
+    _HOOK_IMPORT_ERRORS["ast_chunker"] = e
+
+# Tool result cache — agents repeat the same queries within a session
+# Key: (tool, query, size, ...), Value: (timestamp, results or formatted output)
+# Listing changes invalidate keyword results via the snapshot generation;
+# in-place edits and vector store updates show up once the TTL expires.
+_RESULT_CACHE: dict = {}
+_RESULT_CACHE_TTL = 300  # 5 minutes
+_RESULT_CACHE_MAX = 512  # max entries
+_RESULT_CACHE_STATS = {"hits": 0, "misses": 0}
+
+# Canonical YouTube URLs accepted without a full urlparse (anything else takes the slow path)
+_YOUTUBE_URL_RE = re.compile(
+    r"^https?://(?:(?:www\.|m\.)?youtube\.com|youtu\.be)(?=[/?#]|$)", re.IGNORECASE
+)
+_YOUTUBE_HOSTS = frozenset({"youtube.com", "www.youtube.com", "youtu.be", "m.youtube.com"})
+
+# Skill resource names: word characters and hyphens only (no separators or dots)
+_SAFE_NAME_RE = re.compile(r"[\w\-]+")
+
+# Health probe timestamp: [epoch second, "YYYY-MM-DDTHH:MM:SSZ"]
+_UTC_TS_CACHE: list = [-1, ""]
+
+# Authorization header prefix that unlocks full skill resources
+_PRO_BEARER_PREFIX = "Bearer midos_sk_"
+
+# RESEARCH_INTEREST_QUEUE pending rows: (path, mtime_ns, size, rows)
+_pending_cache: Optional[tuple[str, int, int, List[str]]] = None
+
+# Files at least this large are memory-mapped so only the returned prefix is decoded
+MMAP_MIN_BYTES = 64 * 1024
+
 
 # ============================================================================
 # HELPER FUNCTIONS (unchanged)
@@ -99,33 +172,38 @@ def search_files(
 ) -> List[Dict[str, Any]]:
     """Buscar archivos que contengan query."""
     results = []
-    query_lower = query.lower()
-
-    for ext in extensions:
-        for file_path in directory.rglob(f"*{ext}"):
-            try:
-                content = file_path.read_text(encoding="utf-8", errors="ignore")
-                if query_lower in content.lower() or query_lower in file_path.name.lower():
-                    # Extract snippet around match
-                    idx = content.lower().find(query_lower)
-                    if idx >= 0:
-                        start = max(0, idx - 100)
-                        end = min(len(content), idx + 200)
-                        snippet = content[start:end].strip()
-                    else:
-                        snippet = content[:300].strip()
-
-                    results.append({
-                        "path": str(file_path.relative_to(MIDOS_ROOT)),
-                        "name": file_path.stem,
-                        "snippet": snippet,
-                        "size": len(content),
-                    })
-
-                    if len(results) >= max_results:
-                        return results
-            except OSError:
+    # Case-insensitive scan without lowercasing a copy of every file
+    pattern = re.compile(re.escape(query), re.IGNORECASE)
+
+    # One traversal for all extensions; Path objects only for the hits
+    snap = snapshot(directory, tuple(extensions))
+    for entry in snap.entries():
+        try:
+            content = snap.read_text(entry)
+        except OSError:
+            continue
+
+        # Name hits short-circuit: the file head is the snippet, no body scan
+        if pattern.search(entry.name):
+            snippet = content[:300].strip()
+        else:
+            match = pattern.search(content)
+            if match is None:
                 continue
+            # Extract snippet around match
+            idx = match.start()
+            snippet = content[max(0, idx - 100):idx + 200].strip()
+
+        file_path = Path(entry.path)
+        results.append({
+            "path": str(file_path.relative_to(MIDOS_ROOT)),
+            "name": file_path.stem,
+            "snippet": snippet,
+            "size": len(content),
+        })
+
+        if len(results) >= max_results:
+            return results
 
     return results
 
@@ -133,16 +211,43 @@ def search_files(
 def get_file_content(file_path: Path, max_chars: int = 10000) -> str:
     """Obtener contenido de archivo."""
     try:
-        content = file_path.read_text(encoding="utf-8", errors="ignore")
+        size = file_path.stat().st_size
+        if size < MMAP_MIN_BYTES:
+            content = file_path.read_text(encoding="utf-8", errors="ignore")
+            if len(content) > max_chars:
+                content = content[:max_chars] + f"\n\n[...truncated, {len(content)} total chars]"
+            return content
+
+        with open(file_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            # UTF-8 needs at most 4 bytes per char, so this prefix yields at least
+            # max_chars + 1 chars whenever the file has more than max_chars
+            # (the extra char is what reveals truncation)
+            head = mm[:(max_chars + 1) * 4].decode("utf-8", errors="ignore")
+        content = head.replace("\r\n", "\n").replace("\r", "\n")
         if len(content) > max_chars:
-            content = content[:max_chars] + f"\n\n[...truncated, {len(content)} total chars]"
+            content = content[:max_chars] + f"\n\n[...truncated, {size} total bytes]"
         return content
     except Exception as e:
         return f"Error reading file: {e}"
 
 
+def _read_prefix(file_path: Path, n: int) -> str:
+    """The first n+1 chars of a file (or all of it), decoded and newline-normalized like read_text."""
+    with open(file_path, "rb") as f:
+        # 8 bytes per char covers 4-byte UTF-8 sequences and collapsed \r\n pairs
+        raw = f.read(8 * (n + 1))
+    return raw.decode("utf-8", errors="ignore").replace("\r\n", "\n").replace("\r", "\n")
+
+
 def list_files(directory: Path, pattern: str = "*.md") -> List[Dict[str, str]]:
     """Listar archivos en directorio."""
+    if pattern.startswith("*.") and "*" not in pattern[1:]:
+        # Plain "*.ext": served from the cached snapshot listing
+        snap = snapshot(directory, (pattern[1:],), recursive=False)
+        return list(snap.derived("listing", _build_listing))
+
     files = []
     for file_path in sorted(directory.glob(pattern)):
         files.append({
@@ -152,7 +257,148 @@ def list_files(directory: Path, pattern: str = "*.md") -> List[Dict[str, str]]:
     return files
 
 
-def get_hive_status() -> Dict[str, Any]:
+def _build_listing(entries) -> List[Dict[str, str]]:
+    return [
+        {
+            "name": os.path.splitext(e.name)[0],
+            "path": str(Path(e.path).relative_to(MIDOS_ROOT)),
+        }
+        for e in sorted(entries, key=lambda e: e.name)
+    ]
+
+
+def _build_name_index(entries) -> Dict[str, Any]:
+    exact: Dict[str, str] = {}
+    folded: Dict[str, str] = {}
+    stems: List[str] = []
+    for e in entries:
+        stem = os.path.splitext(e.name)[0]
+        stems.append(stem)
+        exact[stem] = e.path
+        folded.setdefault(stem.casefold(), e.path)  # first in listing order wins, like the glob scan
+    return {"exact": exact, "folded": folded, "stems": stems}
+
+
+def find_document(directory: Path, name: str) -> Optional[Path]:
+    """directory/<name>.md, else the first case-insensitive stem match (None if absent)."""
+    index = snapshot(directory, recursive=False).derived("names", _build_name_index)
+    path = index["exact"].get(name) or index["folded"].get(name.casefold())
+    return Path(path) if path else None
+
+
+def available_documents(directory: Path, limit: int = 20) -> List[str]:
+    """First document stems in listing order, for not-found hints."""
+    return snapshot(directory, recursive=False).derived("names", _build_name_index)["stems"][:limit]
+
+
+def _stack_tokens(stack: str) -> List[str]:
+    """Lowercased tokens of a comma-separated stack filter ('python, React' -> ['python', 'react'])."""
+    return [t.strip().lower() for t in stack.split(",") if t.strip()]
+
+
+def _skill_compat(name: str) -> Optional[str]:
+    """Stack tokens from a skill's compatibility.json (see load_compat), or None."""
+    skill_dir = SKILLS_DIR.parent / "skills" / name
+    if not skill_dir.exists():
+        skill_dir = MIDOS_ROOT / "skills" / name
+    return load_compat(skill_dir / "compatibility.json")
+
+
+def _research_queue_pending(path: Path) -> List[str]:
+    """'- [priority] topic' rows of the PENDING table, reparsed only when the file changes."""
+    global _pending_cache
+    st = path.stat()
+    cached = _pending_cache
+    if cached is not None and cached[:3] == (str(path), st.st_mtime_ns, st.st_size):
+        return cached[3]
+
+    content = path.read_text(encoding="utf-8", errors="ignore")
+    pending = []
+    start = content.find("## PENDING")
+    # Walk lines from the one after the PENDING heading; stop at the next section
+    pos = content.find("\n", start) + 1 if start >= 0 else 0
+    while pos:
+        end = content.find("\n", pos)
+        line = content[pos:end] if end >= 0 else content[pos:]
+        pos = end + 1
+        if "## PENDING" in line:
+            continue
+        if line.startswith("## "):
+            break
+        if line.startswith("| ") and not line.startswith("| #") and not line.startswith("|--"):
+            parts = [p.strip() for p in line.split("|")[1:-1]]
+            if len(parts) >= 3:
+                pending.append(f"- [{parts[2]}] {parts[1]}")
+
+    _pending_cache = (str(path), st.st_mtime_ns, st.st_size, pending)
+    return pending
+
+
+@lru_cache(maxsize=4096)
+def _skill_score(name: str, stack_tokens: tuple[str, ...], compat: Optional[str]) -> int:
+    """Stack relevance: +2 per token in the skill's compatibility data, +1 per token in its name.
+
+    Pure in its arguments (compat is the current load_compat value), so a
+    changed compatibility.json is simply a new cache key.
+    """
+    score = 0
+    if compat:
+        score += 2 * sum(t in compat for t in stack_tokens)
+    name_lower = name.lower().replace("-", " ").replace("_", " ")
+    return score + sum(t in name_lower for t in stack_tokens)
+
+
+def warm_knowledge_index() -> None:
+    """Build the snapshots the tools read so the first calls skip the directory walks."""
+    snapshot(KNOWLEDGE_DIR).entries()
+    list_files(SKILLS_DIR)
+    for d in (PROTOCOLS_DIR, EUREKA_DIR, TRUTH_DIR, MIDOS_ROOT / "knowledge" / "chunks"):
+        snapshot(d, recursive=False).entries()
+
+
+@dataclass(slots=True)
+class YoutubeCommand:
+    """Inbox command queued by research_youtube (field order is the JSON key order)."""
+
+    id: str
+    source: str
+    type: str
+    priority: str
+    payload: Dict[str, str]
+    timestamp: int
+
+
+def _cached_results(key: tuple, now: float) -> Any:
+    entry = _RESULT_CACHE.get(key)
+    if entry is not None and now - entry[0] < _RESULT_CACHE_TTL:
+        _RESULT_CACHE_STATS["hits"] += 1
+        return entry[1]
+    _RESULT_CACHE_STATS["misses"] += 1
+    return None
+
+
+def _store_results(key: tuple, results: Any, now: float) -> None:
+    if len(_RESULT_CACHE) >= _RESULT_CACHE_MAX and key not in _RESULT_CACHE:
+        oldest_key = min(_RESULT_CACHE, key=lambda k: _RESULT_CACHE[k][0])
+        del _RESULT_CACHE[oldest_key]
+    _RESULT_CACHE[key] = (now, results)
+
+
+def _utc_timestamp(now: float) -> str:
+    """UTC ISO-8601 time at second resolution with a Z suffix, formatted once per second."""
+    second = int(now)
+    if second != _UTC_TS_CACHE[0]:
+        _UTC_TS_CACHE[0] = second
+        _UTC_TS_CACHE[1] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(second))
+    return _UTC_TS_CACHE[1]
+
+
+def _load_json(path: Path) -> Any:
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+async def get_hive_status() -> Dict[str, Any]:
     """Obtener estado del hive."""
     status = {
         "timestamp": datetime.now().isoformat(),
@@ -163,43 +409,42 @@ def get_hive_status() -> Dict[str, Any]:
         "recent_pearls": [],
     }
 
-    # Count files
-    if KNOWLEDGE_DIR.exists():
-        status["knowledge_files"] = len(list(KNOWLEDGE_DIR.rglob("*.md")))
-
-    if SKILLS_DIR.exists():
-        status["skills_count"] = len(list(SKILLS_DIR.glob("*.md")))
-
-    if PROTOCOLS_DIR.exists():
-        status["protocols_count"] = len(list(PROTOCOLS_DIR.glob("*.md")))
+    # Count files (cached snapshots; empty when the directory is missing)
+    status["knowledge_files"] = len(snapshot(KNOWLEDGE_DIR).entries())
+    status["skills_count"] = len(snapshot(SKILLS_DIR, recursive=False).entries())
+    status["protocols_count"] = len(snapshot(PROTOCOLS_DIR, recursive=False).entries())
 
-    # Check pearl diver state
+    # Pearl diver state + recent pearls, read concurrently off the event loop
     pearl_state = SYNAPSE_DIR / "pearl_diver_state.json"
-    if pearl_state.exists():
-        try:
-            with open(pearl_state, encoding='utf-8') as f:
-                pd_state = json.load(f)
-                status["pearl_diver"] = {
-                    "files_scanned": pd_state.get("files_scanned", 0),
-                    "pearls_found": pd_state.get("pearls_found", 0),
-                }
-        except (OSError, json.JSONDecodeError, KeyError):
-            pass
-
-    # Recent pearls
     pearls_dir = SYNAPSE_DIR / "pearls"
-    if pearls_dir.exists():
-        pearl_files = sorted(pearls_dir.glob("*.json"), reverse=True)[:3]
-        for pf in pearl_files:
-            try:
-                with open(pf, encoding='utf-8') as f:
-                    pearls = json.load(f)
-                    status["recent_pearls"].append({
-                        "file": pf.name,
-                        "count": len(pearls),
-                    })
-            except (OSError, json.JSONDecodeError):
-                pass
+    pearl_entries = snapshot(pearls_dir, (".json",), recursive=False).entries()
+    pearl_files = [
+        Path(e.path) for e in heapq.nlargest(3, pearl_entries, key=operator.attrgetter("name"))
+    ]
+    has_state = pearl_state.exists()  # checked once: it decides how results unpack below
+    paths = ([pearl_state] if has_state else []) + pearl_files
+    loaded = await asyncio.gather(
+        *(asyncio.to_thread(_load_json, p) for p in paths), return_exceptions=True
+    )
+    if has_state:
+        pd_state, *loaded = loaded
+        if not isinstance(pd_state, (OSError, json.JSONDecodeError)):
+            if isinstance(pd_state, BaseException):
+                raise pd_state
+            status["pearl_diver"] = {
+                "files_scanned": pd_state.get("files_scanned", 0),
+                "pearls_found": pd_state.get("pearls_found", 0),
+            }
+
+    for pf, pearls in zip(pearl_files, loaded):
+        if isinstance(pearls, (OSError, json.JSONDecodeError)):
+            continue
+        if isinstance(pearls, BaseException):
+            raise pearls
+        status["recent_pearls"].append({
+            "file": pf.name,
+            "count": len(pearls),
+        })
 
     return status
 
@@ -227,15 +472,20 @@ async def search_knowledge(query: str, max_results: int = 5) -> str:
         query: Search query (keywords or topic)
         max_results: Maximum results to return (default: 5)
     """
-    results = search_files(query, KNOWLEDGE_DIR, max_results=max_results)
+    key = ("keyword", query, max_results, snapshot(KNOWLEDGE_DIR).generation())
+    now = time.time()
+    results = _cached_results(key, now)
+    if results is None:
+        results = search_files(query, KNOWLEDGE_DIR, max_results=max_results)
+        _store_results(key, results, now)
 
     if not results:
         return f"No results found for: {query}"
 
-    output = f"Found {len(results)} results for '{query}':\n\n"
+    parts = [f"Found {len(results)} results for '{query}':\n\n"]
     for r in results:
-        output += f"## {r['name']}\nPath: {r['path']}\n```\n{r['snippet']}\n```\n\n"
-    return output
+        parts.append(f"## {r['name']}\nPath: {r['path']}\n```\n{r['snippet']}\n```\n\n")
+    return "".join(parts)
 
 
 @mcp.tool
@@ -245,27 +495,22 @@ async def get_skill(name: str) -> str:
     Args:
         name: Skill name (e.g., 'RAG_SYSTEMS_2026_SOTA')
     """
-    skill_path = SKILLS_DIR / f"{name}.md"
-    if not skill_path.exists():
-        for f in SKILLS_DIR.glob("*.md"):
-            if f.stem.lower() == name.lower():
-                skill_path = f
-                break
-
-    if not skill_path.exists():
-        available = [f.stem for f in SKILLS_DIR.glob("*.md")][:20]
+    skill_path = find_document(SKILLS_DIR, name)
+    if skill_path is None:
+        available = available_documents(SKILLS_DIR)
         return f"Skill not found: {name}\n\nAvailable skills: {available}"
 
-    return get_file_content(skill_path)
+    return await asyncio.to_thread(get_file_content, skill_path)
 
 
 @mcp.tool
-async def list_skills(filter: str = "", stack: str = "") -> str:
+async def list_skills(filter: str = "", stack: str = "", top_k: int = 100) -> str:
     """List all available skills/capabilities.
 
     Args:
         filter: Optional filter for skill names
         stack: Optional stack filter, comma-separated (e.g. 'python,react'). Skills with matching compatibility.json are prioritized.
+        top_k: Max skills returned when ranking by stack (default: 100)
     """
     skills = list_files(SKILLS_DIR)
 
@@ -274,40 +519,21 @@ async def list_skills(filter: str = "", stack: str = "") -> str:
 
     # Stack-aware sorting: check compatibility.json in skill directories
     if stack:
-        import json as _json
-        stack_tokens = [t.strip().lower() for t in stack.split(",") if t.strip()]
-        scored_skills = []
-        for s in skills:
-            score = 0
-            skill_dir = SKILLS_DIR.parent / "skills" / s["name"]
-            if not skill_dir.exists():
-                skill_dir = MIDOS_ROOT / "skills" / s["name"]
-            compat_file = skill_dir / "compatibility.json"
-            if compat_file.exists():
-                try:
-                    compat = _json.loads(compat_file.read_text(encoding="utf-8"))
-                    compat_all = (
-                        [x.lower() for x in compat.get("languages", [])]
-                        + [x.lower() for x in compat.get("frameworks", [])]
-                    )
-                    for t in stack_tokens:
-                        if any(t in c for c in compat_all):
-                            score += 2
-                except (OSError, _json.JSONDecodeError):
-                    pass
-            # Also match by name
-            name_lower = s["name"].lower().replace("-", " ").replace("_", " ")
-            for t in stack_tokens:
-                if t in name_lower:
-                    score += 1
-            scored_skills.append((score, s))
-        scored_skills.sort(key=lambda x: x[0], reverse=True)
-        skills = [s for _, s in scored_skills]
-
-    output = f"Available skills ({len(skills)}):\n\n"
-    for s in skills:
-        output += f"- {s['name']}\n"
-    return output
+        stack_tokens = tuple(_stack_tokens(stack))
+        # One worker thread for the whole batch: parses are mtime-cached, so
+        # the per-skill cost is a few stats, cheaper than a thread hop each
+        compats = await asyncio.to_thread(lambda: [_skill_compat(s["name"]) for s in skills])
+        scored_skills = [
+            (_skill_score(s["name"], stack_tokens, compat), s)
+            for s, compat in zip(skills, compats)
+        ]
+        # Same order as a stable descending sort, without sorting the tail
+        top = heapq.nlargest(top_k, scored_skills, key=operator.itemgetter(0))
+        skills = [s for _, s in top]
+
+    parts = [f"Available skills ({len(skills)}):\n\n"]
+    parts.extend(f"- {s['name']}\n" for s in skills)
+    return "".join(parts)
 
 
 @mcp.tool
@@ -317,17 +543,11 @@ async def get_protocol(name: str) -> str:
     Args:
         name: Protocol name (e.g., 'PROTOCOL_NEURAL_LINK')
     """
-    protocol_path = PROTOCOLS_DIR / f"{name}.md"
-    if not protocol_path.exists():
-        for f in PROTOCOLS_DIR.glob("*.md"):
-            if f.stem.lower() == name.lower():
-                protocol_path = f
-                break
-
-    if not protocol_path.exists():
+    protocol_path = find_document(PROTOCOLS_DIR, name)
+    if protocol_path is None:
         return f"Protocol not found: {name}"
 
-    return get_file_content(protocol_path)
+    return await asyncio.to_thread(get_file_content, protocol_path)
 
 
 @mcp.tool
@@ -337,18 +557,12 @@ async def get_eureka(name: str) -> str:
     Args:
         name: EUREKA name (e.g., 'EUREKA_CACHE_SEMANTICA' or 'ATOM_001')
     """
-    eureka_path = EUREKA_DIR / f"{name}.md"
-    if not eureka_path.exists():
-        for f in EUREKA_DIR.glob("*.md"):
-            if f.stem.lower() == name.lower():
-                eureka_path = f
-                break
-
-    if not eureka_path.exists():
-        available = [f.stem for f in EUREKA_DIR.glob("*.md")][:20]
+    eureka_path = find_document(EUREKA_DIR, name)
+    if eureka_path is None:
+        available = available_documents(EUREKA_DIR)
         return f"EUREKA not found: {name}\n\nAvailable EUREKA documents: {available}"
 
-    return get_file_content(eureka_path)
+    return await asyncio.to_thread(get_file_content, eureka_path)
 
 
 @mcp.tool
@@ -358,39 +572,22 @@ async def get_truth(name: str) -> str:
     Args:
         name: Truth patch name (e.g., 'AGENT_MITIGATIONS_CONTEXT_OVERFLOW')
     """
-    truth_path = TRUTH_DIR / f"{name}.md"
-    if not truth_path.exists():
-        for f in TRUTH_DIR.glob("*.md"):
-            if f.stem.lower() == name.lower():
-                truth_path = f
-                break
-
-    if not truth_path.exists():
-        available = [f.stem for f in TRUTH_DIR.glob("*.md")][:20]
+    truth_path = find_document(TRUTH_DIR, name)
+    if truth_path is None:
+        available = available_documents(TRUTH_DIR)
         return f"Truth patch not found: {name}\n\nAvailable truth patches: {available}"
 
-    return get_file_content(truth_path)
+    return await asyncio.to_thread(get_file_content, truth_path)
 
 
 @mcp.tool
 async def hive_status() -> str:
     """Get current status of the Midos hive system."""
-    status = get_hive_status()
-    return json.dumps(status, indent=2)
-
+    status = await get_hive_status()
+    return dumps_json(status).decode()
 
-@mcp.tool
-async def semantic_search(query: str, top_k: int = 5, stack: str = "") -> str:
-    """Semantic search using LanceDB vectors (Gemini embeddings). More intelligent than keyword search.
-
-    Args:
-        query: Natural language query (e.g., 'how to implement RAG pipelines')
-        top_k: Number of results (default: 5)
-        stack: Optional stack filter, comma-separated (e.g. 'python,fastapi'). Results mentioning these are boosted.
-    """
-    if not HIVE_COMMONS_AVAILABLE:
-        raise ToolError("hive_commons not available. Install with: pip install -e ./hive_commons")
 
+def _semantic_search_output(query: str, top_k: int, stack: bool, stack_tokens: tuple[str, ...]) -> str:
     results = search_memory(query, top_k=top_k * 2 if stack else top_k)
 
     if not results:
@@ -398,20 +595,44 @@ async def semantic_search(query: str, top_k: int = 5, stack: str = "") -> str:
 
     # Optional stack filtering: boost results that mention stack tokens
     if stack:
-        stack_tokens = [s.strip().lower() for s in stack.split(",") if s.strip()]
         scored = []
         for r in results:
-            text_lower = r.get("text", "").lower() + " " + r.get("source", "").lower()
-            boost = sum(1 for t in stack_tokens if t in text_lower)
+            text_lower = f"{r.get('text', '')} {r.get('source', '')}".lower()
+            boost = sum(t in text_lower for t in stack_tokens)
             scored.append((boost, r))
-        scored.sort(key=lambda x: x[0], reverse=True)
-        results = [r for _, r in scored[:top_k]]
+        top = heapq.nlargest(top_k, scored, key=operator.itemgetter(0))
+        results = [r for _, r in top]
 
-    output = f"Found {len(results)} semantic matches for '{query}':\n\n"
+    parts = [f"Found {len(results)} semantic matches for '{query}':\n\n"]
     for i, r in enumerate(results, 1):
-        output += f"### {i}. Score: {r.get('score', 0):.3f}\n"
-        output += f"Source: {r.get('source', 'unknown')}\n"
-        output += f"```\n{r.get('text', '')[:500]}\n```\n\n"
+        parts.append(
+            f"### {i}. Score: {r.get('score', 0):.3f}\n"
+            f"Source: {r.get('source', 'unknown')}\n"
+            f"```\n{r.get('text', '')[:500]}\n```\n\n"
+        )
+    return "".join(parts)
+
+
+@mcp.tool
+async def semantic_search(query: str, top_k: int = 5, stack: str = "") -> str:
+    """Semantic search using LanceDB vectors (Gemini embeddings). More intelligent than keyword search.
+
+    Args:
+        query: Natural language query (e.g., 'how to implement RAG pipelines')
+        top_k: Number of results (default: 5)
+        stack: Optional stack filter, comma-separated (e.g. 'python,fastapi'). Results mentioning these are boosted.
+    """
+    if not HIVE_COMMONS_AVAILABLE:
+        raise ToolError("hive_commons not available. Install with: pip install -e ./hive_commons")
+
+    stack_tokens = tuple(_stack_tokens(stack))
+    # The formatted response is cached, so repeats skip LanceDB and formatting
+    key = ("semantic", query, top_k, bool(stack), stack_tokens)
+    now = time.time()
+    output = _cached_results(key, now)
+    if output is None:
+        output = _semantic_search_output(query, top_k, bool(stack), stack_tokens)
+        _store_results(key, output, now)
     return output
 
 
@@ -423,35 +644,35 @@ async def research_youtube(url: str, priority: str = "normal") -> str:
         url: YouTube URL to research
         priority: Priority: 'high', 'normal', 'low'
     """
-    from urllib.parse import urlparse
-
     if not url or len(url) > 2048:
         raise ToolError("Invalid YouTube URL")
-    parsed = urlparse(url)
-    if parsed.scheme not in ("http", "https"):
-        raise ToolError("Invalid URL scheme — only http/https allowed")
-    valid_hosts = {"youtube.com", "www.youtube.com", "youtu.be", "m.youtube.com"}
-    if parsed.hostname not in valid_hosts:
-        raise ToolError(
-            f"Invalid YouTube host: {parsed.hostname}. "
-            f"Must be youtube.com or youtu.be"
-        )
+    if not _YOUTUBE_URL_RE.match(url):
+        # Uncommon forms (ports, userinfo) and rejections: parse for the precise error
+        parsed = urlparse(url)
+        if parsed.scheme not in ("http", "https"):
+            raise ToolError("Invalid URL scheme — only http/https allowed")
+        if parsed.hostname not in _YOUTUBE_HOSTS:
+            raise ToolError(
+                f"Invalid YouTube host: {parsed.hostname}. "
+                f"Must be youtube.com or youtu.be"
+            )
 
-    cmd_file = SYNAPSE_DIR / "inbox" / f"CMD_youtube_{int(time.time())}.json"
-    cmd_file.parent.mkdir(parents=True, exist_ok=True)
+    # Nanosecond stamp: concurrent calls in the same second get distinct files
+    now_ns = time.time_ns()
+    cmd_file = SYNAPSE_DIR / "inbox" / f"CMD_youtube_{now_ns}.json"
 
-    command = {
-        "id": f"mcp_youtube_{int(time.time())}",
-        "source": "MCP_SERVER",
-        "type": "USER_COMMAND",
-        "priority": priority.upper(),
-        "payload": {
+    command = YoutubeCommand(
+        id=f"mcp_youtube_{now_ns}",
+        source="MCP_SERVER",
+        type="USER_COMMAND",
+        priority=priority.upper(),
+        payload={
             "action": f"investigate {url}",
             "content": url,
         },
-        "timestamp": int(time.time()),
-    }
-    cmd_file.write_text(json.dumps(command, indent=2), encoding="utf-8")
+        timestamp=now_ns // 1_000_000_000,
+    )
+    await asyncio.to_thread(write_atomic, cmd_file, dumps_json(command))
 
     return f"YouTube research queued: {url}\nPriority: {priority}\nCommand file: {cmd_file.name}"
 
@@ -463,7 +684,13 @@ async def memory_stats() -> str:
         raise ToolError("hive_commons not available")
 
     stats = get_memory_stats()
-    return json.dumps(stats, indent=2)
+    lookups = _RESULT_CACHE_STATS["hits"] + _RESULT_CACHE_STATS["misses"]
+    stats["result_cache"] = {
+        **_RESULT_CACHE_STATS,
+        "hit_rate": round(_RESULT_CACHE_STATS["hits"] / lookups, 3) if lookups else 0.0,
+        "entries": len(_RESULT_CACHE),
+    }
+    return dumps_json(stats).decode()
 
 
 @mcp.tool
@@ -476,10 +703,9 @@ async def pool_signal(action: str, topic: str, summary: str, affects: str = "")
         summary: Brief description of the action
         affects: Files/resources affected (optional)
     """
+    if get_pool is None:
+        return f"Pool signal error: {_HOOK_IMPORT_ERRORS['instance_pool']}"
     try:
-        sys.path.insert(0, str(MIDOS_ROOT / "hooks"))
-        from instance_pool import get_pool
-
         pool = get_pool()
         success = pool.signal(action, topic, summary, affects=affects)
         return f"Pool signal sent: {action} - {topic}\nSuccess: {success}"
@@ -490,17 +716,14 @@ async def pool_signal(action: str, topic: str, summary: str, affects: str = "")
 @mcp.tool
 async def pool_status() -> str:
     """Get multi-instance coordination pool status and recent activity."""
+    if get_pool is None:
+        return f"Pool status error: {_HOOK_IMPORT_ERRORS['instance_pool']}"
     try:
-        sys.path.insert(0, str(MIDOS_ROOT / "hooks"))
-        from instance_pool import get_pool
-
         pool = get_pool()
         context = pool.format_context()
         stats = pool.get_stats()
 
-        output = context + "\n\n### Statistics\n"
-        output += json.dumps(stats, indent=2)
-        return output
+        return "".join((context, "\n\n### Statistics\n", dumps_json(stats).decode()))
     except Exception as e:
         return f"Pool status error: {e}"
 
@@ -513,20 +736,21 @@ async def episodic_search(query: str, limit: int = 5) -> str:
         query: Search query describing the experience/task
         limit: Maximum results (default: 5)
     """
+    if search_reflexions is None:
+        return f"Episodic search error: {_HOOK_IMPORT_ERRORS['episodic_memory']}"
     try:
-        sys.path.insert(0, str(MIDOS_ROOT / "hooks"))
-        from episodic_memory import search_reflexions
-
         results = search_reflexions(query, limit=limit)
 
         if not results:
             return f"No episodic memories found for: {query}"
 
-        output = f"Found {len(results)} episodic memories:\n\n"
+        parts = [f"Found {len(results)} episodic memories:\n\n"]
         for i, r in enumerate(results, 1):
-            output += f"### {i}. Score: {r.get('score', 0):.3f}\n"
-            output += f"```\n{r.get('text', '')[:300]}\n```\n\n"
-        return output
+            parts.append(
+                f"### {i}. Score: {r.get('score', 0):.3f}\n"
+                f"```\n{r.get('text', '')[:300]}\n```\n\n"
+            )
+        return "".join(parts)
     except Exception as e:
         return f"Episodic search error: {e}"
 
@@ -540,10 +764,9 @@ async def episodic_store(task_type: str, input_preview: str, success: bool = Tru
         input_preview: Brief description of the input/context
         success: Whether the task was successful
     """
+    if store_reflexion is None:
+        return f"Episodic store error: {_HOOK_IMPORT_ERRORS['episodic_memory']}"
     try:
-        sys.path.insert(0, str(MIDOS_ROOT / "hooks"))
-        from episodic_memory import store_reflexion
-
         stored = store_reflexion(
             task_type=task_type,
             input_preview=input_preview,
@@ -565,10 +788,9 @@ async def chunk_code(file_path: str) -> str:
     if not file_path:
         raise ToolError("file_path required")
 
+    if chunk_file is None:
+        return f"Chunk code error: {_HOOK_IMPORT_ERRORS['ast_chunker']}"
     try:
-        sys.path.insert(0, str(MIDOS_ROOT / "hooks"))
-        from ast_chunker import chunk_file
-
         p = Path(file_path)
         if not p.is_absolute():
             p = MIDOS_ROOT / file_path
@@ -578,19 +800,21 @@ async def chunk_code(file_path: str) -> str:
         if result.error:
             return f"Chunking error: {result.error}"
 
-        output = f"## Code Chunks: {result.file_path}\n"
-        output += f"Language: {result.language}\n"
-        output += f"Chunks: {len(result.chunks)}\n"
-        output += f"Parse time: {result.parsing_time_ms:.2f}ms\n\n"
+        parts = [
+            f"## Code Chunks: {result.file_path}\n"
+            f"Language: {result.language}\n"
+            f"Chunks: {len(result.chunks)}\n"
+            f"Parse time: {result.parsing_time_ms:.2f}ms\n\n"
+        ]
 
         for chunk in result.chunks:
-            output += f"### [{chunk.chunk_type}] {chunk.name}\n"
-            output += f"Lines: {chunk.start_line}-{chunk.end_line}\n"
+            parts.append(f"### [{chunk.chunk_type}] {chunk.name}\n")
+            parts.append(f"Lines: {chunk.start_line}-{chunk.end_line}\n")
             if chunk.signature:
-                output += f"```\n{chunk.signature[:200]}\n```\n"
-            output += "\n"
+                parts.append(f"```\n{chunk.signature[:200]}\n```\n")
+            parts.append("\n")
 
-        return output
+        return "".join(parts)
     except Exception as e:
         return f"Chunk code error: {e}"
 
@@ -658,9 +882,10 @@ async def project_status() -> str:
     skills_root = MIDOS_ROOT / "skills"
     staging_dir = kb / "staging"
 
-    n_chunks = len(list(chunks_dir.glob("*.md"))) if chunks_dir.exists() else 0
-    n_eureka = len(list(eureka_dir.glob("*.md"))) if eureka_dir.exists() else 0
-    n_truth = len(list(truth_dir.glob("*.md"))) if truth_dir.exists() else 0
+    chunk_entries = snapshot(chunks_dir, recursive=False).entries()
+    n_chunks = len(chunk_entries)
+    n_eureka = len(snapshot(eureka_dir, recursive=False).entries())
+    n_truth = len(snapshot(truth_dir, recursive=False).entries())
     n_skills = len([d for d in skills_root.iterdir() if d.is_dir() and (d / "SKILL.md").exists()]) if skills_root.exists() else 0
     n_staging = len(list(staging_dir.iterdir())) if staging_dir.exists() else 0
 
@@ -688,33 +913,23 @@ async def project_status() -> str:
     lines.append("")
 
     # --- 2. Recent knowledge (last 5 chunks by mtime) ---
-    if chunks_dir.exists():
-        recent = sorted(chunks_dir.glob("*.md"), key=lambda f: f.stat().st_mtime, reverse=True)[:5]
-        if recent:
-            lines.append("## Recent Knowledge")
-            lines.append("")
-            for f in recent:
-                lines.append(f"- `{f.name}`")
-            lines.append("")
+    # Ranked from snapshot metadata, no per-file stat. mtimes are as of the
+    # last scan (or last content read): an in-place edit that leaves the
+    # directory mtime alone shows up after the next rescan. O(n) top-5;
+    # ties keep listing order like a stable sort
+    recent = heapq.nlargest(5, chunk_entries, key=operator.attrgetter("mtime_ns"))
+    if recent:
+        lines.append("## Recent Knowledge")
+        lines.append("")
+        for e in recent:
+            lines.append(f"- `{e.name}`")
+        lines.append("")
 
     # --- 3. Research queue ---
     rq = kb / "RESEARCH_INTEREST_QUEUE.md"
     if rq.exists():
         try:
-            content = rq.read_text(encoding="utf-8", errors="ignore")
-            # Extract PENDING section
-            pending = []
-            in_pending = False
-            for line in content.split("\n"):
-                if "## PENDING" in line:
-                    in_pending = True
-                    continue
-                if in_pending and line.startswith("## "):
-                    break
-                if in_pending and line.startswith("| ") and not line.startswith("| #") and not line.startswith("|--"):
-                    parts = [p.strip() for p in line.split("|")[1:-1]]
-                    if len(parts) >= 3:
-                        pending.append(f"- [{parts[2]}] {parts[1]}")
+            pending = _research_queue_pending(rq)
             if pending:
                 lines.append("## Research Queue")
                 lines.append("")
@@ -771,7 +986,7 @@ async def project_status() -> str:
     lines.append("- **Handshake once per session** — `agent_handshake` optimizes everything for your context window")
     lines.append("")
     lines.append(f"---")
-    lines.append(f"*MidOS v2026 | {datetime.now().strftime('%Y-%m-%d %H:%M')} | {vec_count:,} vectors | {n_chunks} chunks | {n_eureka} EUREKA*")
+    lines.append(f"*MidOS v2026 | {now_minute()} | {vec_count:,} vectors | {n_chunks} chunks | {n_eureka} EUREKA*")
 
     return "\n".join(lines)
 
@@ -798,50 +1013,46 @@ async def read_skill_resource(skill_name: str) -> str:
     Security: validates path traversal and enforces tier gating.
     Free/community tier gets truncated preview (400 chars).
     """
-    import re
-
-    # Path traversal protection: strip dangerous characters
-    safe_name = re.sub(r"[^\w\-]", "", skill_name)
-    if not safe_name or safe_name != skill_name:
+    # Path traversal protection: only word characters and hyphens
+    if not _SAFE_NAME_RE.fullmatch(skill_name):
         return f"Invalid skill name: {skill_name}"
+    safe_name = skill_name
 
-    skill_path = SKILLS_DIR / f"{safe_name}.md"
-    if not skill_path.exists():
-        for f in SKILLS_DIR.glob("*.md"):
-            if f.stem.lower() == safe_name.lower():
-                skill_path = f
-                break
-
-    if not skill_path.exists():
+    # Exact or case-insensitive match from the cached skills name index
+    skill_path = find_document(SKILLS_DIR, safe_name)
+    if skill_path is None:
         return f"Skill not found: {skill_name}"
 
     # Verify resolved path is inside SKILLS_DIR (defense in depth)
     resolved = skill_path.resolve()
-    if not resolved.is_relative_to(SKILLS_DIR.resolve()):
+    if not resolved.is_relative_to(_SKILLS_DIR_RESOLVED):
         return "Access denied: path traversal detected"
 
-    content = get_file_content(skill_path)
-
     # Tier gating for resources: community tier gets truncated preview
     try:
-        from fastmcp.server.dependencies import get_http_headers
         headers = get_http_headers(include_all=True)
-        auth_header = headers.get("authorization", "")
-        has_valid_key = auth_header.startswith("Bearer midos_sk_")
+        auth_header = headers.get("authorization")
+        has_valid_key = auth_header is not None and auth_header.startswith(_PRO_BEARER_PREFIX)
     except Exception:
         has_valid_key = False
 
-    if not has_valid_key:
-        # Truncate for community tier
-        preview_limit = 400
-        if len(content) > preview_limit:
-            truncated = content[:preview_limit].rsplit("\n", 1)[0]
-            content = (
-                f"{truncated}\n\n"
-                f"---\n"
-                f"> Full skill content available with MidOS Pro.\n"
-                f"> Get your API key at https://midos.dev/pricing"
-            )
+    if has_valid_key:
+        return get_file_content(skill_path)
+
+    # Truncate for community tier: only the head of the file is read
+    preview_limit = 400
+    try:
+        content = _read_prefix(skill_path, preview_limit)
+    except Exception as e:
+        content = f"Error reading file: {e}"
+    if len(content) > preview_limit:
+        truncated = content[:preview_limit].rsplit("\n", 1)[0]
+        content = (
+            f"{truncated}\n\n"
+            f"---\n"
+            f"> Full skill content available with MidOS Pro.\n"
+            f"> Get your API key at https://midos.dev/pricing"
+        )
 
     return content
 
@@ -850,31 +1061,63 @@ async def read_skill_resource(skill_name: str) -> str:
 # HEALTH ENDPOINTS (custom HTTP routes, not MCP tools)
 # ============================================================================
 
+# Liveness body is fixed apart from uptime and timestamp: splice them into
+# prebuilt bytes (same compact JSON that JSONResponse would render)
+_LIVENESS_PREFIX = b'{"status":"ok","server":"midos","uptime_seconds":'
+_LIVENESS_MID = b',"timestamp":"'
+_LIVENESS_SUFFIX = b'"}'
+
+
 @mcp.custom_route("/health", methods=["GET"])
 async def health_liveness(request):
     """Liveness probe — is the server process alive?"""
-    from starlette.responses import JSONResponse
-
-    return JSONResponse({
-        "status": "ok",
-        "server": "midos",
-        "uptime_seconds": round(time.time() - _SERVER_START_TIME, 1),
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-    })
-
-
-@mcp.custom_route("/health/ready", methods=["GET"])
-async def health_readiness(request):
-    """Readiness probe — are all dependencies functional?"""
-    from starlette.responses import JSONResponse
-
+    now = time.time()
+    body = b"".join((
+        _LIVENESS_PREFIX,
+        f"{now - _SERVER_START_TIME:.1f}".encode(),
+        _LIVENESS_MID,
+        _utc_timestamp(now).encode(),
+        _LIVENESS_SUFFIX,
+    ))
+    return Response(body, media_type="application/json")
+
+
+# Readiness checks are reused for a few seconds so probe bursts skip the scans.
+# The encoded body is cached too, split around the uptime/timestamp fields.
+# (expires, head, tail, status_code), replaced by a single assignment: readers
+# never see a half-updated entry and racing rebuilds need no lock (last wins)
+_READY_TTL = 5.0  # seconds (monotonic clock)
+_READY_CACHE: tuple = (0.0, b"", b"", 0)
+# Only these gate readiness; vector_store is optional and reported, not enforced
+# (a 503 makes Kubernetes pull the pod from rotation)
+_CRITICAL = ("knowledge", "skills")
+
+
+def _count_chunks_and_skills(entries) -> tuple:
+    """(chunks, skills): .md files under KNOWLEDGE_DIR/chunks and /skills, from one listing."""
+    root = str(KNOWLEDGE_DIR)
+    chunks_prefix = os.path.join(root, "chunks", "")
+    skills_prefix = os.path.join(root, "skills", "")
+    n_chunks = n_skills = 0
+    for e in entries:
+        if e.path.startswith(chunks_prefix):
+            n_chunks += 1
+        elif e.path.startswith(skills_prefix):
+            n_skills += 1
+    return n_chunks, n_skills
+
+
+def _readiness_checks() -> Dict[str, Dict[str, Any]]:
+    """Probe knowledge, vector store and skills; one status dict per dependency."""
     checks = {}
 
-    # Check knowledge directory
+    # Chunk and skill counts both come from the (already warm) KNOWLEDGE_DIR
+    # snapshot, so one revalidation pass covers both directories
     try:
-        chunk_count = len(list(KNOWLEDGE_DIR.glob("chunks/**/*.md")))
-        checks["knowledge"] = {"status": "up", "chunks": chunk_count}
+        counts = snapshot(KNOWLEDGE_DIR).derived("ready_counts", _count_chunks_and_skills)
+        checks["knowledge"] = {"status": "up", "chunks": counts[0]}
     except Exception as e:
+        counts = None
         checks["knowledge"] = {"status": "down", "error": str(e)}
 
     # Check vector store
@@ -891,32 +1134,62 @@ async def health_readiness(request):
     else:
         checks["vector_store"] = {"status": "unavailable", "reason": "hive_commons not installed"}
 
-    # Check skills directory
-    try:
-        skill_count = len(list((KNOWLEDGE_DIR / "skills").glob("**/*.md")))
-        checks["skills"] = {"status": "up", "count": skill_count}
-    except Exception:
+    if counts is not None:
+        checks["skills"] = {"status": "up", "count": counts[1]}
+    else:
         checks["skills"] = {"status": "down"}
 
-    all_up = all(c.get("status") == "up" for c in checks.values())
-    status_code = 200 if all_up else 503
+    return checks
 
-    return JSONResponse(
-        {
-            "status": "ready" if all_up else "degraded",
-            "server": "midos",
-            "uptime_seconds": round(time.time() - _SERVER_START_TIME, 1),
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "checks": checks,
-        },
-        status_code=status_code,
-    )
+
+def _encode_readiness(checks: Dict[str, Dict[str, Any]]) -> tuple:
+    """(head, tail, status_code): the readiness body minus uptime and timestamp.
+
+    Encoded like JSONResponse (compact, non-ASCII kept) so the spliced body
+    matches what it would render.
+    """
+    all_up = all(checks[k].get("status") == "up" for k in _CRITICAL)
+    status = "ready" if all_up else "degraded"
+    head = f'{{"status":"{status}","server":"midos","uptime_seconds":'.encode()
+    encoded_checks = json.dumps(checks, ensure_ascii=False, allow_nan=False, separators=(",", ":"))
+    tail = f'","checks":{encoded_checks}}}'.encode("utf-8")
+    return head, tail, 200 if all_up else 503
+
+
+@mcp.custom_route("/health/ready", methods=["GET"])
+async def health_readiness(request):
+    """Readiness probe — are all dependencies functional?"""
+    global _READY_CACHE
+    now = time.monotonic()
+    cached = _READY_CACHE
+    if now >= cached[0]:
+        cached = (now + _READY_TTL, *_encode_readiness(_readiness_checks()))
+        _READY_CACHE = cached
+    _, head, tail, status_code = cached
+
+    wall = time.time()
+    body = b"".join((
+        head,
+        f"{wall - _SERVER_START_TIME:.1f}".encode(),
+        _LIVENESS_MID,
+        _utc_timestamp(wall).encode(),
+        tail,
+    ))
+    return Response(body, status_code=status_code, media_type="application/json")
 
 
 # ============================================================================
 # ENTRY POINT
 # ============================================================================
 
+def _print_startup_counts() -> None:
+    """Skill/protocol file counts, read from the snapshots warm_knowledge_index built."""
+    if SKILLS_DIR.exists():
+        print(f"Skills: {len(snapshot(SKILLS_DIR, recursive=False).entries())} files")
+    if PROTOCOLS_DIR.exists():
+        print(f"Protocols: {len(snapshot(PROTOCOLS_DIR, recursive=False).entries())} files")
+
+
 def main():
     """Entry point with dual transport support."""
     import argparse
@@ -925,14 +1198,19 @@ def main():
     parser.add_argument("--http", action="store_true", help="HTTP mode (streamable)")
     parser.add_argument("--host", default="0.0.0.0", help="HTTP host (default: 0.0.0.0)")
     parser.add_argument("--port", type=int, default=8419, help="HTTP port (default: 8419)")
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Fast restart: skip the knowledge index warm-up and startup counts "
+             "(indexes are built lazily on first use)",
+    )
     args = parser.parse_args()
 
     print(f"Starting Midos MCP Server (FastMCP)...")
     print(f"Knowledge dir: {KNOWLEDGE_DIR}")
-    if SKILLS_DIR.exists():
-        print(f"Skills: {len(list(SKILLS_DIR.glob('*.md')))} files")
-    if PROTOCOLS_DIR.exists():
-        print(f"Protocols: {len(list(PROTOCOLS_DIR.glob('*.md')))} files")
+    if not args.quiet:
+        warm_knowledge_index()
+        _print_startup_counts()
 
     if args.http:
         print(f"Transport: streamable-http on {args.host}:{args.port}")
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Bridge CLI Smoke Test
+=====================
+The bootstrap Quick Start tells agents to run the bridge as a plain script
+(python modules/mcp_server/midos_bridge.py ...), so it must work without the
+`modules` package on sys.path and from any working directory.
+
+Usage:
+    pytest tests/test_bridge_cli.py -v
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+BRIDGE = Path(__file__).resolve().parent.parent / "modules" / "mcp_server" / "midos_bridge.py"
+
+
+@pytest.mark.parametrize("cwd", ["repo_root", "elsewhere"])
+def test_bridge_runs_as_script(cwd, tmp_path):
+    """`python midos_bridge.py skills` prints a JSON list from any directory."""
+    workdir = BRIDGE.parents[2] if cwd == "repo_root" else tmp_path
+    proc = subprocess.run(
+        [sys.executable, str(BRIDGE), "skills"],
+        cwd=workdir, capture_output=True, text=True, timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr[-500:]
+    assert isinstance(json.loads(proc.stdout), list)
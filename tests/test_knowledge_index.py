@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Knowledge Index Unit Tests
+==========================
+DirSnapshot invalidation, derived views and the content cache byte budget,
+against throwaway directories (no server needed).
+
+Usage:
+    pytest tests/test_knowledge_index.py -v
+"""
+
+import os
+import sys
+
+import pytest
+
+from modules.mcp_server import knowledge_index as ki
+
+
+def _bump_mtime(path, seconds: int = 1) -> None:
+    """Move a file/dir mtime forward explicitly (coarse filesystem clocks may not tick)."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + seconds * 1_000_000_000))
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    """Isolate the process-wide content cache accounting; returns a budget setter."""
+    monkeypatch.setattr(ki, "_cached_bytes_total", 0)
+
+    def set_budget(nbytes: int) -> None:
+        monkeypatch.setattr(ki, "CONTENT_CACHE_MAX_BYTES", nbytes)
+
+    return set_budget
+
+
+def test_unchanged_directory_reuses_listing(tmp_path):
+    (tmp_path / "a.md").write_text("a", encoding="utf-8")
+    snap = ki.DirSnapshot(tmp_path)
+
+    first = snap.entries()
+    assert snap.entries() is first
+    assert snap.generation() == snap.generation()
+
+
+def test_rescan_after_file_added(tmp_path):
+    (tmp_path / "a.md").write_text("a", encoding="utf-8")
+    snap = ki.DirSnapshot(tmp_path)
+    assert [e.name for e in snap.entries()] == ["a.md"]
+    gen = snap.generation()
+
+    (tmp_path / "b.md").write_text("b", encoding="utf-8")
+    (tmp_path / "skip.txt").write_text("x", encoding="utf-8")
+    _bump_mtime(tmp_path)
+
+    assert sorted(e.name for e in snap.entries()) == ["a.md", "b.md"]
+    assert snap.generation() != gen
+
+
+def test_rescan_after_file_added_in_subdirectory(tmp_path):
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    snap = ki.DirSnapshot(tmp_path)
+    assert snap.entries() == []
+
+    (sub / "c.md").write_text("c", encoding="utf-8")
+    _bump_mtime(sub)
+
+    assert [e.name for e in snap.entries()] == ["c.md"]
+
+
+def test_read_text_sees_in_place_modification(tmp_path, budget):
+    budget(1024 * 1024)
+    path = tmp_path / "a.md"
+    path.write_text("old", encoding="utf-8")
+    snap = ki.DirSnapshot(tmp_path)
+    entry = snap.entries()[0]
+    assert snap.read_text(entry) == "old"
+    assert entry.text == "old"  # cached
+
+    path.write_text("new content", encoding="utf-8")
+    _bump_mtime(path)
+
+    assert snap.read_text(entry) == "new content"
+    assert ki._cached_bytes_total == sys.getsizeof("new content")
+
+
+def test_derived_view_recomputed_when_generation_changes(tmp_path):
+    (tmp_path / "a.md").write_text("a", encoding="utf-8")
+    snap = ki.DirSnapshot(tmp_path)
+    calls = []
+
+    def count(entries):
+        calls.append(1)
+        return len(entries)
+
+    assert snap.derived("count", count) == 1
+    assert snap.derived("count", count) == 1
+    assert len(calls) == 1
+    gen = snap.generation()
+
+    (tmp_path / "b.md").write_text("b", encoding="utf-8")
+    _bump_mtime(tmp_path)
+
+    assert snap.derived("count", count) == 2
+    assert len(calls) == 2
+    assert snap.generation() != gen
+
+
+def test_content_cache_stops_at_byte_budget(tmp_path, budget):
+    text = "é" * 500
+    for name in ("a.md", "b.md", "c.md"):
+        (tmp_path / name).write_text(text, encoding="utf-8")
+    size = sys.getsizeof(text)
+    budget(2 * size + size // 2)  # room for two cached files, not three
+    snap = ki.DirSnapshot(tmp_path)
+
+    for entry in snap.entries():
+        assert snap.read_text(entry) == text  # always served, cached or not
+
+    cached = [e for e in snap.entries() if e.text is not None]
+    assert len(cached) == 2
+    assert ki._cached_bytes_total == 2 * size
+
+
+def test_content_cache_budget_is_shared_across_snapshots(tmp_path, budget):
+    text = "x" * 1000
+    dirs = [tmp_path / "one", tmp_path / "two"]
+    for d in dirs:
+        d.mkdir()
+        (d / "a.md").write_text(text, encoding="utf-8")
+    budget(sys.getsizeof(text))  # room for exactly one file in the whole process
+    snaps = [ki.DirSnapshot(d) for d in dirs]
+
+    for snap in snaps:
+        snap.read_text(snap.entries()[0])
+
+    assert [snap.entries()[0].text is not None for snap in snaps] == [True, False]
+
+
+def test_rescan_releases_cached_bytes(tmp_path, budget):
+    budget(1024 * 1024)
+    (tmp_path / "a.md").write_text("a" * 100, encoding="utf-8")
+    snap = ki.DirSnapshot(tmp_path)
+    snap.read_text(snap.entries()[0])
+    assert ki._cached_bytes_total > 0
+
+    (tmp_path / "b.md").write_text("b", encoding="utf-8")
+    _bump_mtime(tmp_path)
+    snap.entries()
+
+    assert ki._cached_bytes_total == 0
+
+
+def test_zero_budget_disables_content_cache(tmp_path, budget):
+    budget(0)
+    (tmp_path / "a.md").write_text("a", encoding="utf-8")
+    snap = ki.DirSnapshot(tmp_path)
+    entry = snap.entries()[0]
+
+    assert snap.read_text(entry) == "a"
+    assert entry.text is None
+    assert ki._cached_bytes_total == 0